@@ -74,3 +74,4 @@ async def _reroll_bot_status(interval: int) -> None:
     while True:
         await asyncio.sleep(interval)
         packets.bot_stats.cache_clear()
+        glob.bot.__dict__.pop("stats_packet", None)  # wipe cached_property
@@ -1,21 +1,27 @@
 import asyncio
 import copy
+import functools
 import importlib
 import math
+import operator
 import os
-import pprint
 import random
 import secrets
 import signal
 import struct
+import sys
 import time
-import uuid
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from dataclasses import field
 from datetime import datetime
 from importlib.metadata import version as pkg_version
 from pathlib import Path
 from time import perf_counter_ns as clock_ns
+from types import CodeType
+from typing import AsyncIterator
 from typing import Awaitable
 from typing import Callable
 from typing import NamedTuple
@@ -27,7 +33,6 @@ from typing import Union
 
 import aiomysql
 import cmyui.utils
-import psutil
 from cmyui.osu.oppai_ng import OppaiWrapper
 from peace_performance_python.objects import Beatmap as PeaceMap
 from peace_performance_python.objects import Calculator as PeaceCalculator
@@ -63,7 +68,7 @@ BEATMAPS_PATH = Path.cwd() / ".data/osu"
 Messageable = Union["Channel", Player]
 
 
-@dataclass
+@dataclass(slots=True)
 class Context:
     player: Player
     trigger: str
@@ -72,6 +77,10 @@ class Context:
     recipient: Optional[Messageable] = None
     match: Optional[Match] = None
 
+    # the time the command was invoked, so commands
+    # don't each need to call time.time() themselves.
+    now: float = field(default_factory=time.time)
+
 
 Callback = Callable[[Context], Awaitable[Optional[str]]]
 
@@ -85,7 +94,7 @@ class Command(NamedTuple):
 
 
 class CommandSet:
-    __slots__ = ("trigger", "doc", "commands")
+    __slots__ = ("trigger", "doc", "commands", "command_triggers", "_help_by_priv")
 
     def __init__(self, trigger: str, doc: str) -> None:
         self.trigger = trigger
@@ -93,6 +102,12 @@ class CommandSet:
 
         self.commands: list[Command] = []
 
+        # {trigger: command} for every trigger & alias in the set.
+        self.command_triggers: dict[str, Command] = {}
+
+        # {priv: help text}, rendered on first request.
+        self._help_by_priv: dict[Privileges, str] = {}
+
     def add(
         self,
         priv: Privileges,
@@ -100,36 +115,67 @@ class CommandSet:
         hidden: bool = False,
     ) -> Callable[[Callback], Callback]:
         def wrapper(f: Callback) -> Callback:
-            self.commands.append(
-                Command(
-                    # NOTE: this method assumes that functions without any
-                    # triggers will be named like '{self.trigger}_{trigger}'.
-                    triggers=(
-                        [f.__name__.removeprefix(f"{self.trigger}_").strip()] + aliases
-                    ),
-                    callback=f,
-                    priv=priv,
-                    hidden=hidden,
-                    doc=f.__doc__,
+            cmd = Command(
+                # NOTE: this method assumes that functions without any
+                # triggers will be named like '{self.trigger}_{trigger}'.
+                triggers=(
+                    [f.__name__.removeprefix(f"{self.trigger}_").strip()] + aliases
                 ),
+                callback=f,
+                priv=priv,
+                hidden=hidden,
+                doc=f.__doc__,
             )
 
+            self.commands.append(cmd)
+
+            for trigger in cmd.triggers:
+                # first registered command wins, as with a linear scan.
+                # keyed lowercase, as process_commands lowers its input.
+                self.command_triggers.setdefault(sys.intern(trigger.lower()), cmd)
+
+            self._help_by_priv.clear()
             return f
 
         return wrapper
 
+    def help(self, priv: Privileges) -> str:
+        """Show all documented commands in the set accessible with `priv`."""
+        if (help_text := self._help_by_priv.get(priv)) is None:
+            prefix = glob.config.command_prefix
+            help_text = self._help_by_priv[priv] = "\n".join(
+                [
+                    f"{prefix}{self.trigger} {cmd.triggers[0]}: {cmd.doc}"
+                    for cmd in self.commands
+                    # skip those without docs, or with insufficient permissions.
+                    if cmd.doc and priv & cmd.priv == cmd.priv
+                ],
+            )
+
+        return help_text
 
-# TODO: refactor help commands into some base ver
-#       since they're all the same anyways lol.
 
 # not sure if this should be in glob or not,
 # trying to think of some use cases lol..
 regular_commands = []
-command_sets = [
-    mp_commands := CommandSet("mp", "Multiplayer commands."),
-    pool_commands := CommandSet("pool", "Mappool commands."),
-    clan_commands := CommandSet("clan", "Clan commands."),
-]
+
+mp_commands = CommandSet("mp", "Multiplayer commands.")
+pool_commands = CommandSet("pool", "Mappool commands.")
+clan_commands = CommandSet("clan", "Clan commands.")
+
+# {trigger: cmd_set}
+command_sets = {
+    cmd_set.trigger: cmd_set for cmd_set in (mp_commands, pool_commands, clan_commands)
+}
+
+
+# {trigger: command} for every trigger & alias of
+# the regular commands; built once as they're defined.
+regular_command_triggers: dict[str, Command] = {}
+
+# (priv, line) for each documented regular command,
+# precomputed so !help doesn't have to rebuild them.
+_regular_help_lines: list[tuple[Privileges, str]] = []
 
 
 def command(
@@ -138,16 +184,24 @@ def command(
     hidden: bool = False,
 ) -> Callable[[Callback], Callback]:
     def wrapper(f: Callback) -> Callback:
-        regular_commands.append(
-            Command(
-                callback=f,
-                priv=priv,
-                hidden=hidden,
-                triggers=[f.__name__.strip("_")] + aliases,
-                doc=f.__doc__,
-            ),
+        cmd = Command(
+            callback=f,
+            priv=priv,
+            hidden=hidden,
+            triggers=[f.__name__.strip("_")] + aliases,
+            doc=f.__doc__,
         )
 
+        regular_commands.append(cmd)
+
+        for trigger in cmd.triggers:
+            # first registered command wins, as with a linear scan.
+            # keyed lowercase, as process_commands lowers its input.
+            regular_command_triggers.setdefault(sys.intern(trigger.lower()), cmd)
+
+        if cmd.doc:
+            _regular_help_lines.append((priv, f"{cmd.triggers[0]}: {cmd.doc}"))
+
         return f
 
     return wrapper
@@ -163,19 +217,21 @@ def command(
 async def _help(ctx: Context) -> Optional[str]:
     """Show all documented commands the player can access."""
     prefix = glob.config.command_prefix
-    l = ["Individual commands", "-----------"]
+    priv = ctx.player.priv
 
-    for cmd in regular_commands:
-        if not cmd.doc or ctx.player.priv & cmd.priv != cmd.priv:
-            # no doc, or insufficient permissions.
-            continue
-
-        l.append(f"{prefix}{cmd.triggers[0]}: {cmd.doc}")
+    l = ["Individual commands", "-----------"]
+    l.extend(
+        [
+            f"{prefix}{line}"
+            for cmd_priv, line in _regular_help_lines
+            if priv & cmd_priv == cmd_priv
+        ],
+    )
 
     l.append("")  # newline
     l.extend(["Command sets", "-----------"])
 
-    for cmd_set in command_sets:
+    for cmd_set in command_sets.values():
         l.append(f"{prefix}{cmd_set.trigger}: {cmd_set.doc}")
 
     return "\n".join(l)
@@ -185,7 +241,14 @@ async def _help(ctx: Context) -> Optional[str]:
 async def roll(ctx: Context) -> Optional[str]:
     """Roll an n-sided die where n is the number you write (100 default)."""
     if ctx.args and ctx.args[0].isdecimal():
-        max_roll = min(int(ctx.args[0]), 0x7FFF)
+        # anything over 5 digits is past the cap anyways,
+        # so don't bother converting (potentially huge) ints.
+        digits = ctx.args[0].lstrip("0")
+
+        if len(digits) <= 5:
+            max_roll = min(int(digits or "0"), 0x7FFF)
+        else:
+            max_roll = 0x7FFF
     else:
         max_roll = 100
 
@@ -255,12 +318,12 @@ async def changename(ctx: Context) -> Optional[str]:
     if name in glob.config.disallowed_names:
         return "Disallowed username; pick another."
 
-    if await glob.db.fetch("SELECT 1 FROM users WHERE name = %s", [name]):
+    safe_name = name.lower().replace(" ", "_")
+
+    if await glob.db.fetch("SELECT 1 FROM users WHERE safe_name = %s", [safe_name]):
         return "Username already taken by another player."
 
     # all checks passed, update their name
-    safe_name = name.lower().replace(" ", "_")
-
     await glob.db.execute(
         "UPDATE users SET name = %s, safe_name = %s WHERE id = %s",
         [name, safe_name, ctx.player.id],
@@ -285,7 +348,7 @@ async def maplink(ctx: Context) -> Optional[str]:
         bmap = await Beatmap.from_md5(match.map_md5)
     elif spectating and spectating.status.map_id:
         bmap = await Beatmap.from_md5(spectating.status.map_md5)
-    elif time.time() < ctx.player.last_np["timeout"]:
+    elif ctx.now < ctx.player.last_np["timeout"]:
         bmap = ctx.player.last_np["bmap"]
     else:
         return "No map found!"
@@ -401,13 +464,24 @@ async def top(ctx: Context) -> Optional[str]:
 # TODO: !compare (compare to previous !last/!top post's map)
 
 
+@functools.lru_cache(maxsize=256)
+def load_peace_map(osu_file_path: Path, bmap_md5: str) -> PeaceMap:
+    """Load a parsed beatmap for peace, reusing it for the same map version.
+
+    `osu_file_path` should already be verified against `bmap_md5`
+    (through `ensure_local_osu_file`)."""
+    # md5 is only part of the key, so that
+    # stale maps aren't served after an update.
+    return PeaceMap(osu_file_path)
+
+
 @command(Privileges.NORMAL, aliases=["w"], hidden=True)
 async def _with(ctx: Context) -> Optional[str]:
     """Specify custom accuracy & mod combinations with `/np`."""
     if ctx.recipient is not glob.bot:
         return "This command can only be used in DM with bot."
 
-    if time.time() >= ctx.player.last_np["timeout"]:
+    if ctx.now >= ctx.player.last_np["timeout"]:
         return "Please /np a map first!"
 
     bmap: Beatmap = ctx.player.last_np["bmap"]
@@ -428,19 +502,25 @@ async def _with(ctx: Context) -> Optional[str]:
         # parse acc, misses, combo and mods from arguments.
         # tried to balance complexity vs correctness here
         for arg in map(str.lower, ctx.args):
+            # classify each arg by it's last char, only slicing once.
+            suffix = arg[-1:]
+            value = arg[:-1]
+
             # mandatory suffix, combo & nmiss
-            if combo is None and arg.endswith("x") and arg[:-1].isdecimal():
-                combo = int(arg[:-1])
+            if suffix == "x" and combo is None and value.isdecimal():
+                combo = int(value)
                 if combo > bmap.max_combo:
                     return "Invalid combo."
-            elif nmiss is None and arg.endswith("m") and arg[:-1].isdecimal():
-                nmiss = int(arg[:-1])
+            elif suffix == "m" and nmiss is None and value.isdecimal():
+                nmiss = int(value)
                 # TODO: store nobjects?
                 if nmiss > bmap.max_combo:
                     return "Invalid misscount."
             else:
                 # optional prefix/suffix, mods & accuracy
-                arg_stripped = arg.removeprefix("+").removesuffix("%")
+                start = 1 if arg[:1] == "+" else 0
+                end = -1 if suffix == "%" else None
+                arg_stripped = arg[start:end]
                 if (
                     mods is None
                     and arg_stripped.isalpha()
@@ -480,7 +560,7 @@ async def _with(ctx: Context) -> Optional[str]:
 
                 return f"{' '.join(msg)}: {pp:.2f}pp ({sr:.2f}*)"
         else:
-            beatmap = PeaceMap(osu_file_path)
+            beatmap = load_peace_map(osu_file_path, bmap.md5)
             peace = PeaceCalculator()
 
             if mods is not None:
@@ -528,7 +608,7 @@ async def _with(ctx: Context) -> Optional[str]:
             else:
                 return "Invalid syntax: !with <score/mods ...>"
 
-        beatmap = PeaceMap(osu_file_path)
+        beatmap = load_peace_map(osu_file_path, bmap.md5)
         peace = PeaceCalculator()
 
         if mods != Mods.NOMOD:
@@ -549,7 +629,7 @@ async def request(ctx: Context) -> Optional[str]:
     if ctx.args:
         return "Invalid syntax: !request"
 
-    if time.time() >= ctx.player.last_np["timeout"]:
+    if ctx.now >= ctx.player.last_np["timeout"]:
         return "Please /np a map first!"
 
     bmap = ctx.player.last_np["bmap"]
@@ -578,7 +658,7 @@ async def get_apikey(ctx: Context) -> Optional[str]:
         glob.api_keys.pop(ctx.player.api_key)
 
     # generate new token
-    ctx.player.api_key = str(uuid.uuid4())
+    ctx.player.api_key = secrets.token_hex(16)
 
     await glob.db.execute(
         "UPDATE users SET api_key = %s WHERE id = %s",
@@ -602,8 +682,15 @@ async def requests(ctx: Context) -> Optional[str]:
     if ctx.args:
         return "Invalid syntax: !requests"
 
+    # fetch the requesting players' & maps' info with the
+    # requests, rather than looking each of them up separately.
     res = await glob.db.fetchall(
-        "SELECT map_id, player_id, datetime FROM map_requests WHERE active = 1",
+        "SELECT mr.map_id, mr.player_id, mr.datetime, u.name, "
+        "m.artist, m.title, m.version "
+        "FROM map_requests mr "
+        "LEFT JOIN users u ON u.id = mr.player_id "
+        "LEFT JOIN maps m ON m.id = mr.map_id "
+        "WHERE mr.active = 1",
         _dict=False,  # return rows as tuples
     )
 
@@ -612,17 +699,23 @@ async def requests(ctx: Context) -> Optional[str]:
 
     l = [f"Total requests: {len(res)}"]
 
-    for (map_id, player_id, dt) in res:
-        # find player & map for each row, and add to output.
-        if not (p := await glob.players.from_cache_or_sql(id=player_id)):
+    for (map_id, player_id, dt, name, artist, title, version) in res:
+        if name is None:
             l.append(f"Failed to find requesting player ({player_id})?")
             continue
 
-        if not (bmap := await Beatmap.from_bid(map_id)):
+        p_embed = Player.make_embed(player_id, name)
+
+        if artist is not None:
+            bmap_embed = Beatmap.make_embed(map_id, artist, title, version)
+        elif bmap := await Beatmap.from_bid(map_id):
+            # not in sql; fall back to the usual lookup.
+            bmap_embed = bmap.embed
+        else:
             l.append(f"Failed to find requested map ({map_id})?")
             continue
 
-        l.append(f"[{p.embed} @ {dt:%b %d %I:%M%p}] {bmap.embed}.")
+        l.append(f"[{p_embed} @ {dt:%b %d %I:%M%p}] {bmap_embed}.")
 
     return "\n".join(l)
 
@@ -634,17 +727,21 @@ def status_to_id(s: str) -> int:
     return _status_str_to_int_map[s]
 
 
+# !map scope -> maps column (and Beatmap attr) to update by.
+_map_scope_columns = {"set": "set_id", "map": "id"}
+
+
 @command(Privileges.NOMINATOR)
 async def _map(ctx: Context) -> Optional[str]:
     """Changes the ranked status of the most recently /np'ed map."""
     if (
         len(ctx.args) != 2
-        or ctx.args[0] not in ("rank", "unrank", "love")
-        or ctx.args[1] not in ("set", "map")
+        or ctx.args[0] not in _status_str_to_int_map
+        or ctx.args[1] not in _map_scope_columns
     ):
         return "Invalid syntax: !map <rank/unrank/love> <map/set>"
 
-    if time.time() >= ctx.player.last_np["timeout"]:
+    if ctx.now >= ctx.player.last_np["timeout"]:
         return "Please /np a map first!"
 
     bmap = ctx.player.last_np["bmap"]
@@ -658,42 +755,47 @@ async def _map(ctx: Context) -> Optional[str]:
     # for updating cache would be faster?
     # surely this will not scale as well..
 
+    column = _map_scope_columns[ctx.args[1]]
+
     async with glob.db.pool.acquire() as conn:
         async with conn.cursor() as db_cursor:
-            if ctx.args[1] == "set":
-                # update whole set
-                await db_cursor.execute(
-                    "UPDATE maps SET status = %s, frozen = 1 WHERE set_id = %s",
-                    [new_status, bmap.set_id],
-                )
-
-                # select all map ids for clearing map requests.
-                await db_cursor.execute(
-                    "SELECT id FROM maps WHERE set_id = %s",
-                    [bmap.set_id],
-                )
-                map_ids = [row[0] async for row in db_cursor]
+            # update the whole set, or only the map
+            await db_cursor.execute(
+                f"UPDATE maps SET status = %s, frozen = 1 WHERE {column} = %s",
+                [new_status, getattr(bmap, column)],
+            )
 
-                for bmap in glob.cache["beatmapset"][bmap.set_id].maps:
-                    bmap.status = new_status
+            if ctx.args[1] == "set":
+                if bmap_set := glob.cache["beatmapset"].get(bmap.set_id):
+                    # the cached set has all of it's maps; update
+                    # them & collect their ids in the same pass.
+                    map_ids = []
+
+                    for set_bmap in bmap_set.maps:
+                        set_bmap.status = new_status
+                        map_ids.append(set_bmap.id)
+                else:
+                    # deactivate the set's requests by subquery,
+                    # rather than selecting the map ids first.
+                    await db_cursor.execute(
+                        "UPDATE map_requests SET active = 0 "
+                        "WHERE map_id IN (SELECT id FROM maps WHERE set_id = %s)",
+                        [bmap.set_id],
+                    )
+                    map_ids = []
 
             else:
-                # update only map
-                await db_cursor.execute(
-                    "UPDATE maps SET status = %s, frozen = 1 WHERE id = %s",
-                    [new_status, bmap.id],
-                )
-
                 map_ids = [bmap.id]
 
                 if bmap.md5 in glob.cache["beatmap"]:
                     glob.cache["beatmap"][bmap.md5].status = new_status
 
             # deactivate rank requests for all ids
-            for map_id in map_ids:
+            if map_ids:
                 await db_cursor.execute(
-                    "UPDATE map_requests SET active = 0 WHERE map_id = %s",
-                    [map_id],
+                    "UPDATE map_requests SET active = 0 "
+                    f"WHERE map_id IN ({', '.join(['%s'] * len(map_ids))})",
+                    map_ids,
                 )
 
     return f"{bmap.embed} updated to {new_status!s}."
@@ -721,21 +823,19 @@ async def notes(ctx: Context) -> Optional[str]:
     elif days <= 0:
         return "Invalid syntax: !notes <name> <days_back>"
 
-    elif days <= 0:
-        return 'Invalid syntax: !notes <name> <days_back>'
-
     res = await glob.db.fetchall(
         "SELECT `msg`, `time` "
         "FROM `logs` WHERE `to` = %s "
         "AND UNIX_TIMESTAMP(`time`) >= UNIX_TIMESTAMP(NOW()) - %s "
         "ORDER BY `time` ASC",
         [t.id, days * 86400],
+        _dict=False,  # return rows as tuples
     )
 
     if not res:
         return f"No notes found on {t} in the past {days} days."
 
-    return "\n".join(["[{time}] {msg}".format(**row) for row in res])
+    return "\n".join([f"[{msg_time}] {msg}" for msg, msg_time in res])
 
 
 @command(Privileges.MODERATOR, hidden=True)
@@ -773,6 +873,20 @@ SHORTHAND_REASONS = {
 DURATION_MULTIPLIERS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
 
 
+def parse_scaled_duration(s: str) -> Optional[int]:
+    """Parse a duration like '30m' into seconds, or None if invalid."""
+    # 1-6 digits, followed by one of the scales above.
+    if not 2 <= len(s) <= 7:
+        return None
+
+    duration, scale = s[:-1], s[-1]
+
+    if scale not in DURATION_MULTIPLIERS or not duration.isdecimal():
+        return None
+
+    return int(duration) * DURATION_MULTIPLIERS[scale]
+
+
 @command(Privileges.MODERATOR, hidden=True)
 async def silence(ctx: Context) -> Optional[str]:
     """Silence a specified player with a specified duration & reason."""
@@ -785,16 +899,12 @@ async def silence(ctx: Context) -> Optional[str]:
     if t.priv & Privileges.STAFF and not ctx.player.priv & Privileges.DEVELOPER:
         return "Only developers can manage staff members."
 
-    if not (r_match := regexes.SCALED_DURATION.match(ctx.args[1])):
+    if (duration := parse_scaled_duration(ctx.args[1])) is None:
         return "Invalid syntax: !silence <name> <duration> <reason>"
 
-    multiplier = DURATION_MULTIPLIERS[r_match["scale"]]
-
-    duration = int(r_match["duration"]) * multiplier
     reason = " ".join(ctx.args[2:])
 
-    if reason in SHORTHAND_REASONS:
-        reason = SHORTHAND_REASONS[reason]
+    reason = SHORTHAND_REASONS.get(reason, reason)
 
     await t.silence(ctx.player, duration, reason)
     return f"{t} was silenced."
@@ -825,6 +935,10 @@ async def unsilence(ctx: Context) -> Optional[str]:
 """
 
 
+# privileges made up of a single bit, for displaying a player's privs.
+_SINGLE_BIT_PRIVS = tuple(priv for priv in Privileges if priv.bit_count() == 1)
+
+
 @command(Privileges.ADMINISTRATOR, aliases=["u"], hidden=True)
 async def user(ctx: Context) -> Optional[str]:
     """Return general information about a given user."""
@@ -839,20 +953,13 @@ async def user(ctx: Context) -> Optional[str]:
             return "Player not found."
 
     priv_readable = "|".join(
-        reversed(
-            [  # type: ignore
-                priv.name
-                for priv in Privileges
-                if p.priv & priv and bin(priv).count("1") == 1
-            ],
-        ),
+        reversed([priv.name for priv in _SINGLE_BIT_PRIVS if p.priv & priv]),
     )
 
-    current_time = time.time()
-    login_delta = current_time - p.login_time
-    last_recv_delta = current_time - p.last_recv_time
+    login_delta = ctx.now - p.login_time
+    last_recv_delta = ctx.now - p.last_recv_time
 
-    if current_time < p.last_np["timeout"]:
+    if ctx.now < p.last_np["timeout"]:
         last_np = p.last_np["bmap"].embed
     else:
         last_np = None
@@ -892,8 +999,7 @@ async def restrict(ctx: Context) -> Optional[str]:
 
     reason = " ".join(ctx.args[1:])
 
-    if reason in SHORTHAND_REASONS:
-        reason = SHORTHAND_REASONS[reason]
+    reason = SHORTHAND_REASONS.get(reason, reason)
 
     await t.restrict(admin=ctx.player, reason=reason)
 
@@ -918,8 +1024,7 @@ async def unrestrict(ctx: Context) -> Optional[str]:
 
     reason = " ".join(ctx.args[1:])
 
-    if reason in SHORTHAND_REASONS:
-        reason = SHORTHAND_REASONS[reason]
+    reason = SHORTHAND_REASONS.get(reason, reason)
 
     await t.unrestrict(ctx.player, reason)
 
@@ -977,13 +1082,9 @@ async def shutdown(ctx: Context) -> Optional[str]:
         _signal = signal.SIGTERM
 
     if ctx.args:  # shutdown after a delay
-        if not (r_match := regexes.SCALED_DURATION.match(ctx.args[0])):
+        if (delay := parse_scaled_duration(ctx.args[0])) is None:
             return f"Invalid syntax: !{ctx.trigger} <delay> <msg ...>"
 
-        multiplier = DURATION_MULTIPLIERS[r_match["scale"]]
-
-        delay = int(r_match["duration"]) * multiplier
-
         if delay < 15:
             return "Minimum delay is 15 seconds."
 
@@ -1008,7 +1109,11 @@ async def shutdown(ctx: Context) -> Optional[str]:
 # simply not useful for any other roles.
 """
 
-_fake_users = []
+_fake_users: dict[int, Player] = {}  # {id: player}, in order added
+
+# we start at half way through
+# the i32 space for fake user ids.
+FAKE_ID_START = 0x7FFFFFFF >> 1
 
 
 @command(Privileges.DEVELOPER, aliases=["fu"])
@@ -1029,13 +1134,9 @@ async def fakeusers(ctx: Context) -> Optional[str]:
     if not 0 < amount <= 100_000:
         return "Amount must be in range 0-100k."
 
-    # we start at half way through
-    # the i32 space for fake user ids.
-    FAKE_ID_START = 0x7FFFFFFF >> 1
-
     # data to send to clients (all new user info)
     # we'll send all the packets together at end (more efficient)
-    data = bytearray()
+    data: list[bytes] = []
 
     if action == "add":
         const_uinfo = {  # non important stuff
@@ -1051,12 +1152,9 @@ async def fakeusers(ctx: Context) -> Optional[str]:
 
         _stats = packets.user_stats(ctx.player)
 
-        if _fake_users:
-            current_fakes = max([x.id for x in _fake_users]) - (FAKE_ID_START - 1)
-        else:
-            current_fakes = 0
-
-        start_id = FAKE_ID_START + current_fakes
+        # fakes are only ever added to, and removed from, the end,
+        # so their ids are contiguous and the next is just the count.
+        start_id = FAKE_ID_START + len(_fake_users)
         end_id = start_id + amount
         vn_std = GameMode.VANILLA_OSU
 
@@ -1064,8 +1162,17 @@ async def fakeusers(ctx: Context) -> Optional[str]:
         base_player.stats[vn_std] = copy.copy(ctx.player.stats[vn_std])
         new_fakes = []
 
-        # static part of the presence packet,
-        # no need to redo this every iteration.
+        # shallow copies of the base player are made by hand rather
+        # than with copy.copy, skipping the copy protocol's dispatch.
+        base_dict = base_player.__dict__
+        base_slots = [
+            (attr, getattr(base_player, attr))
+            for attr in Player.__slots__
+            if attr != "__dict__" and hasattr(base_player, attr)
+        ]
+
+        # static part of the presence packet, along with the
+        # stats packet; no need to redo this every iteration.
         static_presence = struct.pack(
             "<BBBffi",
             19,  # -5 (EST) + 24
@@ -1075,30 +1182,34 @@ async def fakeusers(ctx: Context) -> Optional[str]:
             0.0,  # lat, lon
             1,  # rank #1
         )
+        static_data = static_presence + _stats
+
+        # packetid, packet len, userid
+        pack_presence_header = struct.Struct("<HxIi").pack
 
         for i in range(start_id, end_id):
             # create new fake player from base
             name = f"fake #{i - (FAKE_ID_START - 1)}"
-            fake = copy.copy(base_player)
+            fake = object.__new__(Player)
+            fake.__dict__ = base_dict.copy()
+            for attr, value in base_slots:
+                setattr(fake, attr, value)
+
             fake.id = i
             fake.name = name
+            fake.safe_name = fake.make_safe(name)
 
             # append userpresence packet
-            data += struct.pack(
-                "<HxIi",
-                83,
-                21 + len(name),
-                i,  # packetid  # packet len  # userid
-            )
-            data += f"\x0b{chr(len(name))}{name}".encode()
-            data += static_presence
-            data += _stats
+            name_bytes = name.encode()
+            data.append(pack_presence_header(83, 21 + len(name_bytes), i))
+            data.append(b"\x0b" + len(name_bytes).to_bytes(1, "little") + name_bytes)
+            data.append(static_data)
 
             new_fakes.append(fake)
 
         # extend all added fakes to the real list
-        _fake_users.extend(new_fakes)
-        glob.players.extend(new_fakes)
+        _fake_users.update({fake.id: fake for fake in new_fakes})
+        glob.players.bulk_add(new_fakes)  # all new ids, no need to check
         del new_fakes
 
         msg = "Added."
@@ -1107,29 +1218,40 @@ async def fakeusers(ctx: Context) -> Optional[str]:
         if amount > len_fake_users:
             return f"Too many! only {len_fake_users} remaining."
 
-        to_remove = _fake_users[len_fake_users - amount :]
-        logout_packet_header = b"\x0c\x00\x00\x05\x00\x00\x00"
+        to_remove = list(_fake_users.values())[len_fake_users - amount :]
+        logged_out = []
 
         for fake in to_remove:
-            if not fake.online:
-                # already auto-dced
-                _fake_users.remove(fake)
-                continue
-
-            data += logout_packet_header
-            data += fake.id.to_bytes(4, "little")  # 4 bytes pid
-            data += b"\x00"  # 1 byte 0
+            del _fake_users[fake.id]
+
+            if fake.online:  # (may have already auto-dced)
+                glob.players.remove(fake)
+                logged_out.append(fake.id)
+
+        # packetid, packet len, userid, 1 byte 0
+        logout_packet = struct.Struct("<HxIiB")
+        logout_data = bytearray(logout_packet.size * len(logged_out))
+
+        for idx, fake_id in enumerate(logged_out):
+            logout_packet.pack_into(
+                logout_data,
+                idx * logout_packet.size,
+                12,
+                5,
+                fake_id,
+                0,
+            )
 
-            glob.players.remove(fake)
-            _fake_users.remove(fake)
+        data.append(logout_data)
 
         msg = "Removed."
 
-    data = bytes(data)  # bytearray -> bytes
+    joined_data = b"".join(data)
 
     # only enqueue data to real users.
-    for o in [x for x in glob.players if x.id < FAKE_ID_START]:
-        o.enqueue(data)
+    for o in glob.players:
+        if o.id < FAKE_ID_START:
+            o.enqueue(joined_data)
 
     return msg
 
@@ -1144,17 +1266,87 @@ async def stealth(ctx: Context) -> Optional[str]:
     return f'Stealth {"enabled" if ctx.player.stealth else "disabled"}.'
 
 
+# number of pp updates to write per transaction in !recalc.
+RECALC_BATCH_SIZE = 1000
+
+# number of threads !recalc all calculates pp on; kept small and separate
+# from the loop's default executor, so logins & avatars aren't starved.
+RECALC_WORKERS = 2
+
+RECALC_TABLES = ("scores_vn", "scores_rx", "scores_ap")
+
+# fetch a map's scores from all tables in a single round-trip;
+# rows are (table, id, acc, mods, max_combo, nmiss).
+RECALC_SCORES_QUERY = " UNION ALL ".join(
+    f"SELECT '{table}' AS tbl, id, acc, mods, max_combo, nmiss "
+    f"FROM {table} WHERE map_md5 = %s AND mode = 0"
+    for table in RECALC_TABLES
+)
+
+RECALC_UPDATE_QUERIES = {
+    table: f"UPDATE {table} SET pp = %s WHERE id = %s" for table in RECALC_TABLES
+}
+
+
+@asynccontextmanager
+async def _transaction(conn: aiomysql.Connection) -> AsyncIterator[None]:
+    """Run the enclosed queries on `conn` in a single transaction,
+    rolling it back if anything raises (or the command is cancelled)."""
+    await conn.begin()
+    try:
+        yield
+    except BaseException:
+        await conn.rollback()
+        raise
+    else:
+        await conn.commit()
+
+
+async def _write_pp_updates(
+    conn: aiomysql.Connection,
+    db_cursor: aiomysql.Cursor,
+    table: str,
+    updates: list[tuple[float, int]],
+) -> None:
+    """Write a batch of (pp, score_id) updates to `table` in one transaction."""
+    async with _transaction(conn):
+        await db_cursor.executemany(RECALC_UPDATE_QUERIES[table], updates)
+
+
+def _calc_scores_pp(
+    osu_file_path: Path,
+    bmap_md5: str,
+    score_rows: Sequence[tuple[str, int, float, int, int, int]],
+) -> list[tuple[str, float, int]]:
+    """Calculate pp for a map's (table, id, acc, mods, combo, nmiss) score rows.
+
+    Runs in a worker thread to keep the event loop responsive (this isn't
+    parallel unless peace-performance releases the gil);
+    returns (table, pp, score_id)."""
+    beatmap = load_peace_map(osu_file_path, bmap_md5)  # parsed once per map
+
+    results = []
+    for table, score_id, acc, mods, max_combo, nmiss in score_rows:
+        peace = PeaceCalculator(mods=mods, miss=nmiss, combo=max_combo, acc=acc)
+        pp = peace.calculate(beatmap).pp
+
+        if math.isnan(pp) or math.isinf(pp):
+            pp = 0.0
+
+        results.append((table, pp, score_id))
+
+    return results
+
+
 @command(Privileges.DEVELOPER)
 async def recalc(ctx: Context) -> Optional[str]:
     """Recalculate pp for a given map, or all maps."""
-    # NOTE: at the moment this command isn't very optimal and re-parses
-    # the beatmap file each iteration; this will be heavily improved.
     if len(ctx.args) != 1 or ctx.args[0] not in ("map", "all"):
         return "Invalid syntax: !recalc <map/all>"
 
     if ctx.args[0] == "map":
         # by specific map, use their last /np
-        if time.time() >= ctx.player.last_np["timeout"]:
+        if ctx.now >= ctx.player.last_np["timeout"]:
             return "Please /np a map first!"
 
         bmap: Beatmap = ctx.player.last_np["bmap"]
@@ -1164,32 +1356,35 @@ async def recalc(ctx: Context) -> Optional[str]:
             return "Mapfile could not be found; this incident has been reported."
 
         async with glob.db.pool.acquire() as conn:
-            async with (
-                conn.cursor(aiomysql.DictCursor) as select_cursor,
-                conn.cursor(aiomysql.Cursor) as update_cursor,
-            ):
-                with OppaiWrapper("oppai-ng/liboppai.so") as ezpp:
-                    ezpp.set_mode(0)  # TODO: other modes
-                    for table in ("scores_vn", "scores_rx", "scores_ap"):
-                        await select_cursor.execute(
-                            "SELECT id, acc, mods, max_combo, nmiss "
-                            f"FROM {table} "
-                            "WHERE map_md5 = %s AND mode = 0",  # TODO: ""
-                            [bmap.md5],
-                        )
-
-                        async for row in select_cursor:
-                            ezpp.set_mods(row["mods"])
-                            ezpp.set_nmiss(row["nmiss"])  # clobbers acc
-                            ezpp.set_combo(row["max_combo"])
-                            ezpp.set_accuracy_percent(row["acc"])
-
-                            ezpp.calculate(osu_file_path)
+            async with conn.cursor(aiomysql.Cursor) as db_cursor:
+                # TODO: other modes
+                await db_cursor.execute(
+                    RECALC_SCORES_QUERY,
+                    [bmap.md5] * len(RECALC_TABLES),
+                )
+                score_rows = await db_cursor.fetchall()
+
+                # calculate in a thread, so the event loop
+                # can keep serving other conns in the meantime.
+                results = await asyncio.to_thread(
+                    _calc_scores_pp,
+                    osu_file_path,
+                    bmap.md5,
+                    score_rows,
+                )
 
-                            await update_cursor.execute(
-                                f"UPDATE {table} SET pp = %s WHERE id = %s",
-                                [ezpp.get_pp(), row["id"]],
-                            )
+                pp_updates = {table: [] for table in RECALC_TABLES}
+                for table, pp, score_id in results:
+                    pp_updates[table].append((pp, score_id))
+
+                for table, table_updates in pp_updates.items():
+                    if table_updates:
+                        await _write_pp_updates(
+                            conn,
+                            db_cursor,
+                            table,
+                            table_updates,
+                        )
 
         return "Map recalculated."
     else:
@@ -1200,61 +1395,122 @@ async def recalc(ctx: Context) -> Optional[str]:
             staff_chan.send_bot(f"{ctx.player} started a full recalculation.")
             st = time.time()
 
-            async with glob.db.pool.acquire() as conn:
+            # the maps are streamed with a server-side cursor, which
+            # holds its connection until exhausted; use a second conn
+            # for the score selects & pp updates while it's in use.
+            async with (
+                glob.db.pool.acquire() as bmap_conn,
+                glob.db.pool.acquire() as conn,
+            ):
                 async with (
-                    conn.cursor(aiomysql.Cursor) as bmap_select_cursor,
-                    conn.cursor(aiomysql.DictCursor) as score_select_cursor,
+                    bmap_conn.cursor(aiomysql.SSCursor) as bmap_select_cursor,
+                    conn.cursor(aiomysql.Cursor) as score_select_cursor,
                     conn.cursor(aiomysql.Cursor) as update_cursor,
                 ):
+                    # rowcount is unknown until a streamed result is read
+                    await score_select_cursor.execute(
+                        "SELECT COUNT(*) FROM maps WHERE passes > 0",
+                    )
+                    (map_count,) = await score_select_cursor.fetchone()
+                    staff_chan.send_bot(f"Recalculating {map_count} maps.")
+
                     await bmap_select_cursor.execute(
                         "SELECT id, md5 FROM maps WHERE passes > 0",
                     )
 
-                    map_count = bmap_select_cursor.rowcount
-                    staff_chan.send_bot(f"Recalculating {map_count} maps.")
+                    # {table: [(pp, score_id), ...]} pending writes
+                    pp_updates = {table: [] for table in RECALC_TABLES}
 
-                    async for bmap_row in bmap_select_cursor:
-                        bmap_id, bmap_md5 = bmap_row
-
-                        osu_file_path = BEATMAPS_PATH / f"{bmap_id}.osu"
-                        if not await ensure_local_osu_file(
-                            osu_file_path,
-                            bmap_id,
-                            bmap_md5,
-                        ):
-                            staff_chan.send_bot(
-                                "[Recalc] Couldn't find " f"{bmap_id} / {bmap_md5}",
-                            )
-                            continue
-
-                        with OppaiWrapper("oppai-ng/liboppai.so") as ezpp:
-                            ezpp.set_mode(0)  # TODO: other modes
-                            for table in ("scores_vn", "scores_rx", "scores_ap"):
-                                await score_select_cursor.execute(
-                                    "SELECT id, acc, mods, max_combo, nmiss "
-                                    f"FROM {table} "
-                                    "WHERE map_md5 = %s AND mode = 0",  # TODO: ""
-                                    [bmap_md5],
-                                )
-
-                                async for row in score_select_cursor:
-                                    ezpp.set_mods(row["mods"])
-                                    ezpp.set_nmiss(row["nmiss"])  # clobbers acc
-                                    ezpp.set_combo(row["max_combo"])
-                                    ezpp.set_accuracy_percent(row["acc"])
+                    # score rows are fetched here, while the pp calculation
+                    # itself is run on recalc's own threads (one job per map).
+                    loop = asyncio.get_running_loop()
+                    executor = ThreadPoolExecutor(
+                        max_workers=RECALC_WORKERS,
+                        thread_name_prefix="recalc",
+                    )
+                    pending: set[asyncio.Future] = set()
+                    max_pending = RECALC_WORKERS * 2
+
+                    async def harvest(
+                        return_when: str = asyncio.FIRST_COMPLETED,
+                    ) -> None:
+                        nonlocal pending
+                        done, pending = await asyncio.wait(
+                            pending,
+                            return_when=return_when,
+                        )
 
-                                    ezpp.calculate(osu_file_path)
+                        for fut in done:
+                            for table, pp, score_id in fut.result():
+                                pp_updates[table].append((pp, score_id))
+
+                        for table, table_updates in pp_updates.items():
+                            if len(table_updates) >= RECALC_BATCH_SIZE:
+                                await _write_pp_updates(
+                                    conn,
+                                    update_cursor,
+                                    table,
+                                    table_updates,
+                                )
+                                table_updates.clear()
+
+                    try:
+                        async for bmap_row in bmap_select_cursor:
+                            bmap_id, bmap_md5 = bmap_row
+
+                            osu_file_path = BEATMAPS_PATH / f"{bmap_id}.osu"
+                            if not await ensure_local_osu_file(
+                                osu_file_path,
+                                bmap_id,
+                                bmap_md5,
+                            ):
+                                staff_chan.send_bot(
+                                    "[Recalc] Couldn't find " f"{bmap_id} / {bmap_md5}",
+                                )
+                                continue
 
-                                    await update_cursor.execute(
-                                        f"UPDATE {table} "
-                                        "SET pp = %s "
-                                        "WHERE id = %s",
-                                        [ezpp.get_pp(), row["id"]],
-                                    )
+                            # TODO: other modes
+                            await score_select_cursor.execute(
+                                RECALC_SCORES_QUERY,
+                                [bmap_md5] * len(RECALC_TABLES),
+                            )
+                            score_rows = await score_select_cursor.fetchall()
+
+                            if not score_rows:
+                                continue
+
+                            pending.add(
+                                loop.run_in_executor(
+                                    executor,
+                                    _calc_scores_pp,
+                                    osu_file_path,
+                                    bmap_md5,
+                                    score_rows,
+                                ),
+                            )
 
-                        # leave at least 1/100th of
-                        # a second for handling conns.
-                        await asyncio.sleep(0.01)
+                            if len(pending) >= max_pending:
+                                await harvest()
+
+                        if pending:
+                            await harvest(asyncio.ALL_COMPLETED)
+                    finally:
+                        # don't start any queued calculations if we errored
+                        # out; the ones already running can't be interrupted.
+                        for fut in pending:
+                            fut.cancel()
+
+                        executor.shutdown(wait=False, cancel_futures=True)
+
+                    # write any remaining updates
+                    for table, table_updates in pp_updates.items():
+                        if table_updates:
+                            await _write_pp_updates(
+                                conn,
+                                update_cursor,
+                                table,
+                                table_updates,
+                            )
 
             elapsed = misc.utils.seconds_readable(int(time.time() - st))
             staff_chan.send_bot(f"Recalculation complete. | Elapsed: {elapsed}")
@@ -1294,13 +1550,14 @@ async def addpriv(ctx: Context) -> Optional[str]:
     if len(ctx.args) < 2:
         return "Invalid syntax: !addpriv <name> <role1 role2 role3 ...>"
 
-    bits = Privileges(0)
-
-    for m in [m.lower() for m in ctx.args[1:]]:
-        if m not in str_priv_dict:
-            return f"Not found: {m}."
-
-        bits |= str_priv_dict[m]
+    try:
+        bits = functools.reduce(
+            operator.or_,
+            (str_priv_dict[m.lower()] for m in ctx.args[1:]),
+            Privileges(0),
+        )
+    except KeyError as exc:
+        return f"Not found: {exc.args[0]}."
 
     if not (t := await glob.players.from_cache_or_sql(name=ctx.args[0])):
         return "Could not find user."
@@ -1315,13 +1572,14 @@ async def rmpriv(ctx: Context) -> Optional[str]:
     if len(ctx.args) < 2:
         return "Invalid syntax: !rmpriv <name> <role1 role2 role3 ...>"
 
-    bits = Privileges(0)
-
-    for m in [m.lower() for m in ctx.args[1:]]:
-        if m not in str_priv_dict:
-            return f"Not found: {m}."
-
-        bits |= str_priv_dict[m]
+    try:
+        bits = functools.reduce(
+            operator.or_,
+            (str_priv_dict[m.lower()] for m in ctx.args[1:]),
+            Privileges(0),
+        )
+    except KeyError as exc:
+        return f"Not found: {exc.args[0]}."
 
     if not (t := await glob.players.from_cache_or_sql(name=ctx.args[0])):
         return "Could not find user."
@@ -1335,7 +1593,7 @@ async def wipemap(ctx: Context) -> Optional[str]:
     if ctx.args:
         return "Invalid syntax: !wipemap"
 
-    if time.time() >= ctx.player.last_np["timeout"]:
+    if ctx.now >= ctx.player.last_np["timeout"]:
         return "Please /np a map first!"
 
     map_md5 = ctx.player.last_np["bmap"].md5
@@ -1385,17 +1643,9 @@ async def reload(ctx: Context) -> Optional[str]:
     return f"Reloaded {mod.__name__}"
 
 
-@command(Privileges.NORMAL)
-async def server(ctx: Context) -> Optional[str]:
-    """Retrieve performance data about the server."""
-
-    build_str = f'sutekina v{glob.version!r} ({glob.config.domain})'
-
-    # get info about this process
-    proc = psutil.Process(os.getpid())
-    uptime = int(time.time() - proc.create_time())
-
-    # get info about our cpu
+@functools.cache
+def _cpus_info() -> str:
+    """Return all cpus installed with thread count (read once)."""
     with open("/proc/cpuinfo") as f:
         header = "model name\t: "
         trailer = "\n"
@@ -1406,17 +1656,12 @@ async def server(ctx: Context) -> Optional[str]:
             if line.startswith("model name")
         )
 
-    # list of all cpus installed with thread count
-    cpus_info = " | ".join([f"{v}x {k}" for k, v in model_names.most_common()])
+    return " | ".join([f"{v}x {k}" for k, v in model_names.most_common()])
 
-    # get system-wide ram usage
-    sys_ram = psutil.virtual_memory()
-
-    # output ram usage as `{gulag_used}MB / {sys_used}MB / {sys_total}MB`
-    gulag_ram = proc.memory_info()[0]
-    ram_values = (gulag_ram, sys_ram.used, sys_ram.total)
-    ram_info = " / ".join([f"{v // 1024 ** 2}MB" for v in ram_values])
 
+@functools.cache
+def _requirements_info() -> str:
+    """Return the required packages & their versions (read once)."""
     # divide up pkg versions, 3 displayed per line, e.g.
     # aiohttp v3.6.3 | aiomysql v0.0.21 | bcrypt v3.2.0
     # cmyui v1.7.3 | datadog v0.40.1 | geoip2 v4.1.0
@@ -1425,6 +1670,34 @@ async def server(ctx: Context) -> Optional[str]:
     reqs = (Path.cwd() / "requirements.txt").read_text().splitlines()
     pkg_sections = [reqs[i : i + 3] for i in range(0, len(reqs), 3)]
 
+    return "\n".join(
+        [
+            " | ".join([f"{pkg} v{pkg_version(pkg)}" for pkg in section])
+            for section in pkg_sections
+        ],
+    )
+
+
+@command(Privileges.NORMAL)
+async def server(ctx: Context) -> Optional[str]:
+    """Retrieve performance data about the server."""
+    # only needed here; no need to load it at startup.
+    import psutil
+
+    build_str = f'sutekina v{glob.version!r} ({glob.config.domain})'
+
+    # get info about this process
+    proc = psutil.Process(os.getpid())
+    uptime = int(ctx.now - proc.create_time())
+
+    # get system-wide ram usage
+    sys_ram = psutil.virtual_memory()
+
+    # output ram usage as `{gulag_used}MB / {sys_used}MB / {sys_total}MB`
+    gulag_ram = proc.memory_info()[0]
+    ram_values = (gulag_ram, sys_ram.used, sys_ram.total)
+    ram_info = " / ".join([f"{v // 1024 ** 2}MB" for v in ram_values])
+
     mirror_url = glob.config.mirror
     using_osuapi = glob.config.osu_api_key != ""
     advanced_mode = glob.config.advanced
@@ -1433,18 +1706,13 @@ async def server(ctx: Context) -> Optional[str]:
     return "\n".join(
         [
             f"{build_str} | uptime: {seconds_readable(uptime)}",
-            f"cpu(s): {cpus_info}",
+            f"cpu(s): {_cpus_info()}",
             f"ram: {ram_info}",
             f"mirror: {mirror_url} | osu!api connection: {using_osuapi}",
             f"advanced mode: {advanced_mode} | auto logging: {auto_logging}",
             "",
             "requirements",
-            "\n".join(
-                [
-                    " | ".join([f"{pkg} v{pkg_version(pkg)}" for pkg in section])
-                    for section in pkg_sections
-                ],
-            ),
+            _requirements_info(),
         ],
     )
 
@@ -1478,6 +1746,11 @@ if glob.config.advanced:
         if mod in installed_mods
     }
 
+    @functools.lru_cache(maxsize=64)
+    def _compile_py(definition: str) -> CodeType:
+        """Compile a !py definition, reusing it for repeated inputs."""
+        return compile(definition, "<!py>", "exec")
+
     @command(Privileges.DEVELOPER)
     async def py(ctx: Context) -> Optional[str]:
         """Allow for (async) access to the python interpreter."""
@@ -1491,7 +1764,7 @@ if glob.config.advanced:
         definition = "\n ".join(["async def __py(ctx):", " ".join(ctx.args)])
 
         try:  # def __py(ctx)
-            exec(definition, __py_namespace)  # add to namespace
+            exec(_compile_py(definition), __py_namespace)  # add to namespace
             ret = await __py_namespace["__py"](ctx)  # await it's return
         except Exception as exc:  # return exception in osu! chat
             ret = f"{exc.__class__}: {exc}"
@@ -1505,6 +1778,8 @@ if glob.config.advanced:
         # TODO: perhaps size checks?
 
         if not isinstance(ret, str):
+            import pprint
+
             ret = pprint.pformat(ret, compact=True)
 
         return ret
@@ -1515,21 +1790,20 @@ if glob.config.advanced:
 # Most commands are open to player usage.
 """
 
+# bound once; matched on every pick/ban/unban, scrim & pool command.
+_PICK_FULLMATCH = regexes.MAPPOOL_PICK.fullmatch
+_BEST_OF_FULLMATCH = regexes.BEST_OF.fullmatch
 
-@mp_commands.add(Privileges.NORMAL, aliases=["h"])
-async def mp_help(ctx: Context) -> Optional[str]:
-    """Show all documented multiplayer commands the player can access."""
-    prefix = glob.config.command_prefix
-    cmds = []
 
-    for cmd in mp_commands.commands:
-        if not cmd.doc or ctx.player.priv & cmd.priv != cmd.priv:
-            # no doc, or insufficient permissions.
-            continue
+def pack_pick(mods: Mods, slot: int) -> int:
+    """Pack a pick into a single int, as stored in a match's bans."""
+    return (slot << 32) | int(mods)  # mods fit in 31 bits
 
-        cmds.append(f"{prefix}mp {cmd.triggers[0]}: {cmd.doc}")
 
-    return "\n".join(cmds)
+@mp_commands.add(Privileges.NORMAL, aliases=["h"])
+async def mp_help(ctx: Context) -> Optional[str]:
+    """Show all documented multiplayer commands the player can access."""
+    return mp_commands.help(ctx.player.priv)
 
 
 @mp_commands.add(Privileges.NORMAL, aliases=["st"])
@@ -1547,7 +1821,7 @@ async def mp_start(ctx: Context) -> Optional[str]:
     if not ctx.args:
         # !mp start
         if ctx.match.starting["start"] is not None:
-            time_remaining = int(ctx.match.starting["time"] - time.time())
+            time_remaining = int(ctx.match.starting["time"] - ctx.now)
             return f"Match starting in {time_remaining} seconds."
 
         if any([s.status == SlotStatus.not_ready for s in ctx.match.slots]):
@@ -1556,7 +1830,7 @@ async def mp_start(ctx: Context) -> Optional[str]:
         if ctx.args[0].isdecimal():
             # !mp start N
             if ctx.match.starting["start"] is not None:
-                time_remaining = int(ctx.match.starting["time"] - time.time())
+                time_remaining = int(ctx.match.starting["time"] - ctx.now)
                 return f"Match starting in {time_remaining} seconds."
 
             # !mp start <seconds>
@@ -1592,7 +1866,7 @@ async def mp_start(ctx: Context) -> Optional[str]:
                 for t in (60, 30, 10, 5, 4, 3, 2, 1)
                 if t < duration
             ]
-            ctx.match.starting["time"] = time.time() + duration
+            ctx.match.starting["time"] = ctx.now + duration
 
             return f"Match will start in {duration} seconds."
         elif ctx.args[0] in ("cancel", "c"):
@@ -1685,32 +1959,35 @@ async def mp_freemods(ctx: Context) -> Optional[str]:
     if len(ctx.args) != 1 or ctx.args[0] not in ("on", "off"):
         return "Invalid syntax: !mp freemods <on/off>"
 
+    match = ctx.match
+    active_slots = [s for s in match.slots if s.status & SlotStatus.has_player]
+
     if ctx.args[0] == "on":
         # central mods -> all players mods.
-        ctx.match.freemods = True
+        match.freemods = True
 
-        for s in ctx.match.slots:
-            if s.status & SlotStatus.has_player:
-                # the slot takes any non-speed
-                # changing mods from the match.
-                s.mods = ctx.match.mods & ~SPEED_CHANGING_MODS
+        # the slots take any non-speed
+        # changing mods from the match.
+        slot_mods = match.mods & ~SPEED_CHANGING_MODS
 
-        ctx.match.mods &= SPEED_CHANGING_MODS
+        for s in active_slots:
+            s.mods = slot_mods
+
+        match.mods &= SPEED_CHANGING_MODS
     else:
         # host mods -> central mods.
-        ctx.match.freemods = False
+        match.freemods = False
 
-        host = ctx.match.get_host_slot()  # should always exist
+        host = match.get_host_slot()  # should always exist
         # the match keeps any speed-changing mods,
         # and also takes any mods the host has enabled.
-        ctx.match.mods &= SPEED_CHANGING_MODS
-        ctx.match.mods |= host.mods
+        match.mods &= SPEED_CHANGING_MODS
+        match.mods |= host.mods
 
-        for s in ctx.match.slots:
-            if s.status & SlotStatus.has_player:
-                s.mods = Mods.NOMOD
+        for s in active_slots:
+            s.mods = Mods.NOMOD
 
-    ctx.match.enqueue_state()
+    match.enqueue_state()
     return "Match freemod status updated."
 
 
@@ -1907,7 +2184,7 @@ async def mp_condition(ctx: Context) -> Optional[str]:
 @mp_commands.add(Privileges.NORMAL, aliases=["autoref"])
 async def mp_scrim(ctx: Context) -> Optional[str]:
     """Start a scrim in the current match."""
-    if len(ctx.args) != 1 or not (r_match := regexes.BEST_OF.fullmatch(ctx.args[0])):
+    if len(ctx.args) != 1 or not (r_match := _BEST_OF_FULLMATCH(ctx.args[0])):
         return "Invalid syntax: !mp scrim <bo#>"
 
     if not 0 <= (best_of := int(r_match[1])) < 16:
@@ -2041,11 +2318,12 @@ async def mp_unloadpool(ctx: Context) -> Optional[str]:
     return "Mappool unloaded."
 
 
-@mp_commands.add(Privileges.NORMAL)
-async def mp_ban(ctx: Context) -> Optional[str]:
-    """Ban a pick in the currently loaded mappool."""
+def _parse_pick(ctx: Context, syntax: str) -> Union[tuple[Mods, int, Beatmap], str]:
+    """Parse the pick in `ctx.args` from the match's pool.
+
+    Returns (mods, slot, bmap), or an error message to respond with."""
     if len(ctx.args) != 1:
-        return "Invalid syntax: !mp ban <pick>"
+        return f"Invalid syntax: {syntax}"
 
     if not ctx.match.pool:
         return "No pool currently selected!"
@@ -2053,79 +2331,64 @@ async def mp_ban(ctx: Context) -> Optional[str]:
     mods_slot = ctx.args[0]
 
     # separate mods & slot
-    if not (r_match := regexes.MAPPOOL_PICK.fullmatch(mods_slot)):
+    if not (r_match := _PICK_FULLMATCH(mods_slot)):
         return "Invalid pick syntax; correct example: HD2"
 
     # not calling mods.filter_invalid_combos here intentionally.
     mods = Mods.from_modstr(r_match[1])
     slot = int(r_match[2])
 
-    if (mods, slot) not in ctx.match.pool.maps:
+    if not (bmap := ctx.match.pool.maps.get((mods, slot))):
         return f"Found no {mods_slot} pick in the pool."
 
-    if (mods, slot) in ctx.match.bans:
-        return "That pick is already banned!"
-
-    ctx.match.bans.add((mods, slot))
-    return f"{mods_slot} banned."
+    return mods, slot, bmap
 
 
 @mp_commands.add(Privileges.NORMAL)
-async def mp_unban(ctx: Context) -> Optional[str]:
-    """Unban a pick in the currently loaded mappool."""
-    if len(ctx.args) != 1:
-        return "Invalid syntax: !mp unban <pick>"
+async def mp_ban(ctx: Context) -> Optional[str]:
+    """Ban a pick in the currently loaded mappool."""
+    if isinstance(pick := _parse_pick(ctx, "!mp ban <pick>"), str):
+        return pick  # error
 
-    if not ctx.match.pool:
-        return "No pool currently selected!"
+    mods, slot, _ = pick
+    bans = ctx.match.bans
 
-    mods_slot = ctx.args[0]
+    if (ban_key := pack_pick(mods, slot)) in bans:
+        return "That pick is already banned!"
 
-    # separate mods & slot
-    if not (r_match := regexes.MAPPOOL_PICK.fullmatch(mods_slot)):
-        return "Invalid pick syntax; correct example: HD2"
+    bans.add(ban_key)
+    return f"{ctx.args[0]} banned."
 
-    # not calling mods.filter_invalid_combos here intentionally.
-    mods = Mods.from_modstr(r_match[1])
-    slot = int(r_match[2])
 
-    if (mods, slot) not in ctx.match.pool.maps:
-        return f"Found no {mods_slot} pick in the pool."
+@mp_commands.add(Privileges.NORMAL)
+async def mp_unban(ctx: Context) -> Optional[str]:
+    """Unban a pick in the currently loaded mappool."""
+    if isinstance(pick := _parse_pick(ctx, "!mp unban <pick>"), str):
+        return pick  # error
 
-    if (mods, slot) not in ctx.match.bans:
+    mods, slot, _ = pick
+    bans = ctx.match.bans
+
+    if (ban_key := pack_pick(mods, slot)) not in bans:
         return "That pick is not currently banned!"
 
-    ctx.match.bans.remove((mods, slot))
-    return f"{mods_slot} unbanned."
+    bans.remove(ban_key)
+    return f"{ctx.args[0]} unbanned."
 
 
 @mp_commands.add(Privileges.NORMAL)
 async def mp_pick(ctx: Context) -> Optional[str]:
     """Pick a map from the currently loaded mappool."""
-    if len(ctx.args) != 1:
-        return "Invalid syntax: !mp pick <pick>"
-
-    if not ctx.match.pool:
-        return "No pool currently loaded!"
+    if isinstance(pick := _parse_pick(ctx, "!mp pick <pick>"), str):
+        return pick  # error
 
+    mods, slot, bmap = pick
     mods_slot = ctx.args[0]
 
-    # separate mods & slot
-    if not (r_match := regexes.MAPPOOL_PICK.fullmatch(mods_slot)):
-        return "Invalid pick syntax; correct example: HD2"
-
-    # not calling mods.filter_invalid_combos here intentionally.
-    mods = Mods.from_modstr(r_match[1])
-    slot = int(r_match[2])
-
-    if (mods, slot) not in ctx.match.pool.maps:
-        return f"Found no {mods_slot} pick in the pool."
-
-    if (mods, slot) in ctx.match.bans:
+    if pack_pick(mods, slot) in ctx.match.bans:
         return f"{mods_slot} has been banned from being picked."
 
     # update match beatmap to the picked map.
-    bmap = ctx.match.pool.maps[(mods, slot)]
     ctx.match.map_md5 = bmap.md5
     ctx.match.map_id = bmap.id
     ctx.match.map_name = bmap.full
@@ -2158,17 +2421,7 @@ async def mp_pick(ctx: Context) -> Optional[str]:
 @pool_commands.add(Privileges.TOURNAMENT, aliases=["h"], hidden=True)
 async def pool_help(ctx: Context) -> Optional[str]:
     """Show all documented mappool commands the player can access."""
-    prefix = glob.config.command_prefix
-    cmds = []
-
-    for cmd in pool_commands.commands:
-        if not cmd.doc or ctx.player.priv & cmd.priv != cmd.priv:
-            # no doc, or insufficient permissions.
-            continue
-
-        cmds.append(f"{prefix}pool {cmd.triggers[0]}: {cmd.doc}")
-
-    return "\n".join(cmds)
+    return pool_commands.help(ctx.player.priv)
 
 
 @pool_commands.add(Privileges.TOURNAMENT, aliases=["c"], hidden=True)
@@ -2226,7 +2479,7 @@ async def pool_add(ctx: Context) -> Optional[str]:
     if len(ctx.args) != 2:
         return "Invalid syntax: !pool add <name> <pick>"
 
-    if time.time() >= ctx.player.last_np["timeout"]:
+    if ctx.now >= ctx.player.last_np["timeout"]:
         return "Please /np a map first!"
 
     name, mods_slot = ctx.args
@@ -2234,7 +2487,7 @@ async def pool_add(ctx: Context) -> Optional[str]:
     bmap = ctx.player.last_np["bmap"]
 
     # separate mods & slot
-    if not (r_match := regexes.MAPPOOL_PICK.fullmatch(mods_slot)):
+    if not (r_match := _PICK_FULLMATCH(mods_slot)):
         return "Invalid pick syntax; correct example: HD2"
 
     if len(r_match[1]) % 2 != 0:
@@ -2243,12 +2496,13 @@ async def pool_add(ctx: Context) -> Optional[str]:
     # not calling mods.filter_invalid_combos here intentionally.
     mods = Mods.from_modstr(r_match[1])
     slot = int(r_match[2])
+    key = (mods, slot)
 
     if not (pool := glob.pools.get_by_name(name)):
         return "Could not find a pool by that name!"
 
-    if (mods, slot) in pool.maps:
-        return f"{mods_slot} is already {pool.maps[(mods, slot)].embed}!"
+    if existing := pool.maps.get(key):
+        return f"{mods_slot} is already {existing.embed}!"
 
     if bmap in pool.maps.values():
         return "Map is already in the pool!"
@@ -2262,7 +2516,7 @@ async def pool_add(ctx: Context) -> Optional[str]:
     )
 
     # add to cache
-    pool.maps[(mods, slot)] = bmap
+    pool.maps[key] = bmap
 
     return f"{bmap.embed} added to {name}."
 
@@ -2277,17 +2531,18 @@ async def pool_remove(ctx: Context) -> Optional[str]:
     mods_slot = mods_slot.upper()  # ocd
 
     # separate mods & slot
-    if not (r_match := regexes.MAPPOOL_PICK.fullmatch(mods_slot)):
+    if not (r_match := _PICK_FULLMATCH(mods_slot)):
         return "Invalid pick syntax; correct example: HD2"
 
     # not calling mods.filter_invalid_combos here intentionally.
     mods = Mods.from_modstr(r_match[1])
     slot = int(r_match[2])
+    key = (mods, slot)
 
     if not (pool := glob.pools.get_by_name(name)):
         return "Could not find a pool by that name!"
 
-    if (mods, slot) not in pool.maps:
+    if key not in pool.maps:
         return f"Found no {mods_slot} pick in the pool."
 
     # delete from db
@@ -2297,7 +2552,7 @@ async def pool_remove(ctx: Context) -> Optional[str]:
     )
 
     # remove from cache
-    del pool.maps[(mods, slot)]
+    del pool.maps[key]
 
     return f"{mods_slot} removed from {name}."
 
@@ -2309,12 +2564,13 @@ async def pool_list(ctx: Context) -> Optional[str]:
         return "There are currently no pools!"
 
     l = [f"Mappools ({len(pools)})"]
-
-    for pool in pools:
-        l.append(
+    l.extend(
+        [
             f"[{pool.created_at:%Y-%m-%d}] {pool.id}. "
-            f"{pool.name}, by {pool.created_by}.",
-        )
+            f"{pool.name}, by {pool.created_by}."
+            for pool in pools
+        ],
+    )
 
     return "\n".join(l)
 
@@ -2330,13 +2586,13 @@ async def pool_info(ctx: Context) -> Optional[str]:
     if not (pool := glob.pools.get_by_name(name)):
         return "Could not find a pool by that name!"
 
-    _time = pool.created_at.strftime("%H:%M:%S%p")
-    _date = pool.created_at.strftime("%Y-%m-%d")
-    datetime_fmt = f"Created at {_time} on {_date}"
+    dt = pool.created_at
+    datetime_fmt = f"Created at {dt:%H:%M:%S%p} on {dt:%Y-%m-%d}"
     l = [f"{pool.id}. {pool.name}, by {pool.created_by} | {datetime_fmt}."]
 
-    for (mods, slot), bmap in pool.maps.items():
-        l.append(f"{mods!r}{slot}: {bmap.embed}")
+    l.extend(
+        [f"{mods!r}{slot}: {bmap.embed}" for (mods, slot), bmap in pool.maps.items()],
+    )
 
     return "\n".join(l)
 
@@ -2346,21 +2602,14 @@ async def pool_info(ctx: Context) -> Optional[str]:
 # clans, for users, clan staff, and server staff.
 """
 
+# {clan_priv: name} for displaying member ranks.
+_CLAN_PRIV_NAMES = {priv.value: priv.name for priv in ClanPrivileges}
+
 
 @clan_commands.add(Privileges.NORMAL, aliases=["h"])
 async def clan_help(ctx: Context) -> Optional[str]:
     """Show all documented clan commands the player can access."""
-    prefix = glob.config.command_prefix
-    cmds = []
-
-    for cmd in clan_commands.commands:
-        if not cmd.doc or ctx.player.priv & cmd.priv != cmd.priv:
-            # no doc, or insufficient permissions.
-            continue
-
-        cmds.append(f"{prefix}clan {cmd.triggers[0]}: {cmd.doc}")
-
-    return "\n".join(cmds)
+    return clan_commands.help(ctx.player.priv)
 
 
 @clan_commands.add(Privileges.NORMAL, aliases=["c"])
@@ -2386,13 +2635,25 @@ async def clan_create(ctx: Context) -> Optional[str]:
 
     created_at = datetime.now()
 
-    # add clan to sql (generates id)
-    clan_id = await glob.db.execute(
-        "INSERT INTO clans "
-        "(name, tag, created_at, owner) "
-        "VALUES (%s, %s, %s, %s)",
-        [name, tag, created_at, ctx.player.id],
-    )
+    # add clan to sql (generates id), and set the owner's
+    # clan & clan priv, together in a single transaction.
+    async with glob.db.pool.acquire() as conn:
+        async with conn.cursor() as db_cursor, _transaction(conn):
+            await db_cursor.execute(
+                "INSERT INTO clans "
+                "(name, tag, created_at, owner) "
+                "VALUES (%s, %s, %s, %s)",
+                [name, tag, created_at, ctx.player.id],
+            )
+            clan_id = db_cursor.lastrowid
+
+            await db_cursor.execute(
+                "UPDATE users "
+                "SET clan_id = %s, "
+                "clan_priv = 3 "  # ClanPrivileges.Owner
+                "WHERE id = %s",
+                [clan_id, ctx.player.id],
+            )
 
     # add clan to cache
     clan = Clan(
@@ -2404,26 +2665,14 @@ async def clan_create(ctx: Context) -> Optional[str]:
     )
     glob.clans.append(clan)
 
-    # set owner's clan & clan priv (cache & sql)
+    # set owner's clan & clan priv (cache)
     ctx.player.clan = clan
     ctx.player.clan_priv = ClanPrivileges.Owner
 
     clan.owner = ctx.player.id
     clan.members.add(ctx.player.id)
 
-    if "full_name" in ctx.player.__dict__:
-        del ctx.player.full_name  # wipe cached_property
-
-    if 'full_name' in p.__dict__:
-        del p.full_name # wipe cached_property
-
-    await glob.db.execute(
-        "UPDATE users "
-        "SET clan_id = %s, "
-        "clan_priv = 3 "  # ClanPrivileges.Owner
-        "WHERE id = %s",
-        [clan_id, ctx.player.id],
-    )
+    ctx.player.__dict__.pop("full_name", None)  # wipe cached_property
 
     # announce clan creation
     if announce_chan := glob.channels["#announce"]:
@@ -2448,23 +2697,24 @@ async def clan_disband(ctx: Context) -> Optional[str]:
         if not (clan := ctx.player.clan):
             return "You're not a member of a clan!"
 
-    # delete clan from sql
-    await glob.db.execute("DELETE FROM clans WHERE id = %s", [clan.id])
+    # delete clan & reset its members' clan privs from sql,
+    # together in a single transaction.
+    async with glob.db.pool.acquire() as conn:
+        async with conn.cursor() as db_cursor, _transaction(conn):
+            await db_cursor.execute("DELETE FROM clans WHERE id = %s", [clan.id])
+            await db_cursor.execute(
+                "UPDATE users SET clan_id = 0, clan_priv = 0 WHERE clan_id = %s",
+                [clan.id],
+            )
 
     # remove all members from the clan,
-    # reset their clan privs (cache & sql).
+    # reset their clan privs (cache).
     # NOTE: only online players need be to be uncached.
-    for member_id in clan.members:
-        if member := glob.players.get(id=member_id):
-            member.clan = None
-            member.clan_priv = None
-            if "full_name" in member.__dict__:
-                del member.full_name  # wipe cached_property
-
-    await glob.db.execute(
-        "UPDATE users SET clan_id = 0, clan_priv = 0 WHERE clan_id = %s",
-        [clan.id],
-    )
+    for member_id in clan.members & glob.players.ids:
+        member = glob.players.get(id=member_id)
+        member.clan = None
+        member.clan_priv = None
+        member.__dict__.pop("full_name", None)  # wipe cached_property
 
     # remove clan from cache
     glob.clans.remove(clan)
@@ -2498,9 +2748,12 @@ async def clan_info(ctx: Context) -> Optional[str]:
         _dict=False,
     )
 
-    for member_name, clan_priv in res:
-        priv_str = ("Member", "Officer", "Owner")[clan_priv - 1]
-        msg.append(f"[{priv_str}] {member_name}")
+    msg.extend(
+        [
+            f"[{_CLAN_PRIV_NAMES[clan_priv]}] {member_name}"
+            for member_name, clan_priv in res
+        ],
+    )
 
     return "\n".join(msg)
 
@@ -2524,8 +2777,12 @@ async def clan_list(ctx: Context) -> Optional[str]:
 
     msg = [f'sutekina clans listing ({total_clans} total).']
 
-    for idx, clan in enumerate(glob.clans, offset):
-        msg.append(f"{idx + 1}. {clan!r}")
+    msg.extend(
+        [
+            f"{idx + 1}. {clan!r}"
+            for idx, clan in enumerate(glob.clans[offset : offset + 25], offset)
+        ],
+    )
 
     return "\n".join(msg)
 
@@ -2535,6 +2792,11 @@ class CommandResponse(TypedDict):
     hidden: bool
 
 
+# the config is loaded before this module, and doesn't change at runtime.
+COMMAND_PREFIX = glob.config.command_prefix
+COMMAND_PREFIX_LEN = len(COMMAND_PREFIX)
+
+
 async def process_commands(
     p: Player,
     target: Messageable,
@@ -2542,65 +2804,63 @@ async def process_commands(
 ) -> Optional[CommandResponse]:
     # response is either a CommandResponse if we hit a command,
     # or simply False if we don't have any command hits.
-    start_time = clock_ns()
+    if not msg.startswith(COMMAND_PREFIX):
+        return None
 
-    prefix_len = len(glob.config.command_prefix)
-    trigger, *args = msg[prefix_len:].strip().split(" ")
+    trigger, *args = msg[COMMAND_PREFIX_LEN:].strip().split(" ")
 
     # case-insensitive triggers
     trigger = trigger.lower()
 
-    for cmd_set in command_sets:
-        # check if any command sets match.
-        if trigger == cmd_set.trigger:
-            # matching set found;
-            if not args:
-                args = ["help"]
-
-            if trigger == "mp":
-                # multi set is a bit of a special case,
-                # as we do some additional checks.
-                if not (m := p.match):
-                    # player not in a match
-                    return
+    if cmd_set := command_sets.get(trigger):
+        # matching set found;
+        if not args:
+            args = ["help"]
 
-                if target is not m.chat:
-                    # message not in match channel
-                    return
+        if trigger == "mp":
+            # multi set is a bit of a special case,
+            # as we do some additional checks.
+            if not (m := p.match):
+                # player not in a match
+                return
 
-                if args[0] != "help" and (
-                    p not in m.refs and not p.priv & Privileges.TOURNAMENT
-                ):
-                    # doesn't have privs to use !mp commands (allow help).
-                    return
+            if target is not m.chat:
+                # message not in match channel
+                return
+
+            if args[0] != "help" and (
+                p not in m.refs and not p.priv & Privileges.TOURNAMENT
+            ):
+                # doesn't have privs to use !mp commands (allow help).
+                return
 
-                target = m  # send match for mp commands instead of chan
+            target = m  # send match for mp commands instead of chan
 
-            trigger, *args = args  # get subcommand
+        trigger, *args = args  # get subcommand
 
-            # case-insensitive triggers
-            trigger = trigger.lower()
+        # case-insensitive triggers
+        trigger = trigger.lower()
 
-            commands = cmd_set.commands
-            break
+        cmd = cmd_set.command_triggers.get(trigger)
     else:
         # no set commands matched, check normal commands.
-        commands = regular_commands
+        cmd = regular_command_triggers.get(trigger)
 
-    for cmd in commands:
-        if trigger in cmd.triggers and p.priv & cmd.priv == cmd.priv:
-            # found matching trigger with sufficient privs
-            ctx = Context(player=p, trigger=trigger, args=args)
+    if cmd is not None and p.priv & cmd.priv == cmd.priv:
+        # found matching trigger with sufficient privs
+        ctx = Context(player=p, trigger=trigger, args=args)
 
-            if isinstance(target, Match):
-                ctx.match = target
-            else:
-                ctx.recipient = target
+        if isinstance(target, Match):
+            ctx.match = target
+        else:
+            ctx.recipient = target
+
+        # command found & we have privileges, run it.
+        start_time = clock_ns()
 
-            # command found & we have privileges, run it.
-            if res := await cmd.callback(ctx):
-                elapsed = cmyui.utils.magnitude_fmt_time(clock_ns() - start_time)
+        if res := await cmd.callback(ctx):
+            elapsed = cmyui.utils.magnitude_fmt_time(clock_ns() - start_time)
 
-                return {"resp": f"{res} | Elapsed: {elapsed}", "hidden": cmd.hidden}
+            return {"resp": f"{res} | Elapsed: {elapsed}", "hidden": cmd.hidden}
 
-            return {"resp": None, "hidden": False}
+        return {"resp": None, "hidden": False}
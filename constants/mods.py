@@ -127,20 +127,15 @@ class Mods(IntFlag):
     @functools.lru_cache(maxsize=64)
     def from_modstr(cls, s: str) -> "Mods":
         # from fmt: `HDDTRX`
-        mods = cls.NOMOD
-        _dict = modstr2mod_dict  # global
-
-        # split into 2 character chunks
-        mod_strs = [s[idx : idx + 2].upper() for idx in range(0, len(s), 2)]
+        mods = 0
+        _dict = _modstr2mod_value_dict  # global
 
-        # find matching mods
-        for m in mod_strs:
-            if m not in _dict:
-                continue
+        # split into 2 character chunks & find matching mods;
+        # combine as ints & only construct the flag once.
+        for idx in range(0, len(s), 2):
+            mods |= _dict.get(s[idx : idx + 2].upper(), 0)
 
-            mods |= _dict[m]
-
-        return mods
+        return cls(mods)
 
     @classmethod
     @functools.lru_cache(maxsize=64)
@@ -195,6 +190,10 @@ modstr2mod_dict = {
     "CO": Mods.KEYCOOP,
 }
 
+# same as above, but with plain int values for
+# combining; or'ing enum members is much slower.
+_modstr2mod_value_dict = {k: v.value for k, v in modstr2mod_dict.items()}
+
 npstr2mod_dict = {
     "-NoFail": Mods.NOFAIL,
     "-Easy": Mods.EASY,
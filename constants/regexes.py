@@ -21,8 +21,6 @@ NOW_PLAYING = re.compile(
     r"(?P<mods>(?: (?:-|\+|~|\|)\w+(?:~|\|)?)+)?\x01$",
 )
 
-SCALED_DURATION = re.compile(r"^(?P<duration>\d{1,6})" r"(?P<scale>s|m|h|d|w)$")
-
 TOURNEY_MATCHNAME = re.compile(
     r"^(?P<name>[a-zA-Z0-9_ ]+): "
     r"\((?P<T1>[a-zA-Z0-9_ ]+)\)"
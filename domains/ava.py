@@ -1,4 +1,8 @@
+import asyncio
+import functools
+import os
 import re
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 from typing import Union
@@ -19,29 +23,68 @@ AVATARS_PATH = Path.cwd() / ".data/avatars"
 
 DEFAULT_AVATAR = AVATARS_PATH / "default.png"
 
+# max number of avatar files to keep in memory.
+AVATAR_CACHE_MAX = 512
+
+# {path: (mtime_ns, data)}, least recently used first.
+_avatar_cache: OrderedDict[Path, tuple[int, bytes]] = OrderedDict()
 
-@domain.route(re.compile(r"^/(?:\d{1,10}(?:\.(?:jpg|jpeg|png))?|favicon\.ico)?$"))
-async def get_avatar(conn: Connection) -> HTTPResponse:
-    filename = conn.path[1:]
 
-    if "." in filename:
+@functools.lru_cache(maxsize=4096)
+def _resolve_avatar_path(filename: str, avatars_mtime_ns: int) -> Path:
+    """Resolve a requested avatar filename to the file to serve.
+
+    `avatars_mtime_ns` is the avatar directory's mtime, which changes as
+    avatars are added or removed; stale entries simply age out of the cache."""
+    user_id, ext = os.path.splitext(filename)
+
+    if not user_id.isdecimal():
+        # empty path or favicon, serve default avatar
+        return DEFAULT_AVATAR
+
+    if ext:
         # user id & file extension provided
         path = AVATARS_PATH / filename
-        if not path.exists():
-            path = DEFAULT_AVATAR
-    elif filename not in ("", "favicon.ico"):
-        # user id provided - determine file extension
-        for ext in ("jpg", "jpeg", "png"):
-            path = AVATARS_PATH / f"{filename}.{ext}"
-            if path.exists():
-                break
-        else:
-            # no file exists
-            path = DEFAULT_AVATAR
-    else:
-        # empty path or favicon, serve default avatar
-        path = DEFAULT_AVATAR
+        return path if path.exists() else DEFAULT_AVATAR
+
+    # user id provided - determine file extension
+    for ext in (".jpg", ".jpeg", ".png"):
+        path = AVATARS_PATH / f"{user_id}{ext}"
+        if path.exists():
+            return path
+
+    # no file exists
+    return DEFAULT_AVATAR
+
+
+async def _read_avatar(path: Path) -> bytes:
+    """Read an avatar file, reusing the cached copy if it's unmodified."""
+    mtime_ns = path.stat().st_mtime_ns
+
+    if (cached := _avatar_cache.get(path)) and cached[0] == mtime_ns:
+        _avatar_cache.move_to_end(path)
+        return cached[1]
+
+    # read off the event loop, so concurrent
+    # requests don't serialize on the disk.
+    data = await asyncio.to_thread(path.read_bytes)
+
+    _avatar_cache[path] = (mtime_ns, data)
+    _avatar_cache.move_to_end(path)
+
+    if len(_avatar_cache) > AVATAR_CACHE_MAX:
+        _avatar_cache.popitem(last=False)
+
+    return data
+
+
+@domain.route(re.compile(r"^/(?:\d{1,10}(?:\.(?:jpg|jpeg|png))?|favicon\.ico)?$"))
+async def get_avatar(conn: Connection) -> HTTPResponse:
+    path = _resolve_avatar_path(
+        conn.path[1:],
+        AVATARS_PATH.stat().st_mtime_ns,
+    )
 
     ext = "png" if path.suffix == ".png" else "jpeg"
     conn.resp_headers["Content-Type"] = f"image/{ext}"
-    return path.read_bytes()
+    return await _read_avatar(path)
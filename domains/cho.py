@@ -64,6 +64,14 @@ BASE_DOMAIN = glob.config.domain
 _domain_escaped = BASE_DOMAIN.replace(".", r"\.")
 domain = Domain(re.compile(rf"^c[e4-6]?\.(?:{_domain_escaped}|ppy\.sh)$"))
 
+# bound once; these are hit for every login & chat message.
+_OSU_VERSION_MATCH = regexes.OSU_VERSION.match
+_NOW_PLAYING_MATCH = regexes.NOW_PLAYING.match
+_CMD_PREFIX = commands.COMMAND_PREFIX
+
+# /np's mode names, as sent by the osu! client.
+_MODE_VN_BY_NAME = {"Taiko": 1, "CatchTheBeat": 2, "osu!mania": 3}
+
 
 @domain.route("/")
 async def bancho_http_handler(conn: Connection) -> bytes:
@@ -149,12 +157,32 @@ async def bancho_handler(conn: Connection) -> HTTPResponse:
     # allowing logic to be implemented around the actual handler.
     # NOTE: any unhandled packets will be ignored internally.
 
+    # only keep track of the handled packets' names when we'll log them.
+    debug = glob.app.debug
+
+    # the packets may take the player out of their match;
+    # it'll still need any pending state changes flushed.
+    match = player.match
+
     packets_handled = []
     for packet in BanchoPacketReader(conn.body, packet_map):
-        await packet.handle(player)
-        packets_handled.append(packet.__class__.__name__)
+        # most handlers are synchronous; only
+        # the ones doing i/o return a coroutine.
+        if (coro := packet.handle(player)) is not None:
+            await coro
+
+        if debug:
+            packets_handled.append(type(packet).__name__)
 
-    if glob.app.debug:
+    # flush any match state changes from this request's
+    # packets now, so they make it into this response.
+    if match:
+        match.flush_state()
+
+    if player.match:
+        player.match.flush_state()
+
+    if debug:
         packets_str = ", ".join(packets_handled) or "None"
         log(f"[BANCHO] {player} | {packets_str}.", RGB(0xFF68AB))
 
@@ -190,12 +218,14 @@ def register(
 
 @register(ClientPackets.PING, restricted=True)
 class Ping(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         pass  # ping be like
 
 
 @register(ClientPackets.CHANGE_ACTION, restricted=True)
 class ChangeAction(BasePacket):
+    __slots__ = ("action", "info_text", "map_md5", "mods", "mode", "map_id")
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.action = reader.read_u8()
         self.info_text = reader.read_string()
@@ -204,24 +234,40 @@ class ChangeAction(BasePacket):
         self.mode = reader.read_u8()
         self.map_id = reader.read_i32()
 
-    async def handle(self, p: Player) -> None:
-        # update the user's status.
-        p.status.action = Action(self.action)
-        p.status.info_text = self.info_text
-        p.status.map_md5 = self.map_md5
-        p.status.mods = Mods(self.mods)
-
-        if p.status.mods & Mods.RELAX:
+    def handle(self, p: Player) -> None:
+        if self.mods & Mods.RELAX:
             self.mode += 4
-        elif p.status.mods & Mods.AUTOPILOT:
+        elif self.mods & Mods.AUTOPILOT:
             self.mode = 7
 
-        p.status.mode = GameMode(self.mode)
-        p.status.map_id = self.map_id
+        status = p.status
+
+        if (
+            status.action == self.action
+            and status.info_text == self.info_text
+            and status.map_md5 == self.map_md5
+            and status.mods == self.mods
+            and status.mode == self.mode
+            and status.map_id == self.map_id
+        ):
+            # the client resent its current status;
+            # there's nothing new to tell anyone.
+            return
+
+        # update the user's status.
+        status.action = Action(self.action)
+        status.info_text = self.info_text
+        status.map_md5 = self.map_md5
+        status.mods = Mods(self.mods)
+        status.mode = GameMode(self.mode)
+        status.map_id = self.map_id
+
+        p.__dict__.pop("presence_packet", None)  # wipe cached_property
+        p.__dict__.pop("stats_packet", None)  # wipe cached_property
 
         # broadcast it to all online players.
         if not p.restricted:
-            glob.players.enqueue(packets.user_stats(p))
+            glob.players.enqueue(p.stats_packet)
 
 
 IGNORED_CHANNELS = ["#highlight", "#userlog"]
@@ -229,6 +275,8 @@ IGNORED_CHANNELS = ["#highlight", "#userlog"]
 
 @register(ClientPackets.SEND_PUBLIC_MESSAGE)
 class SendMessage(BasePacket):
+    __slots__ = ("msg",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.msg = reader.read_message()
 
@@ -250,14 +298,12 @@ class SendMessage(BasePacket):
         elif recipient == "#spectator":
             if p.spectating:
                 # we are spectating someone
-                spec_id = p.spectating.id
+                t_chan = p.spectating.spec_channel
             elif p.spectators:
                 # we are being spectated
-                spec_id = p.id
+                t_chan = p.spec_channel
             else:
                 return
-
-            t_chan = glob.channels[f"#spec_{spec_id}"]
         elif recipient == "#multiplayer":
             if not p.match:
                 # they're not in a match?
@@ -289,7 +335,7 @@ class SendMessage(BasePacket):
                 ),
             )
 
-        if msg.startswith(glob.config.command_prefix):
+        if msg.startswith(_CMD_PREFIX):
             cmd = await commands.process_commands(p, t_chan, msg)
         else:
             cmd = None
@@ -316,7 +362,7 @@ class SendMessage(BasePacket):
             # check if the user is /np'ing a map.
             # even though this is a public channel,
             # we'll update the player's last np stored.
-            if r_match := regexes.NOW_PLAYING.match(msg):
+            if r_match := _NOW_PLAYING_MATCH(msg):
                 # the player is /np'ing a map.
                 # save it to their player instance
                 # so we can use this elsewhere owo..
@@ -325,9 +371,7 @@ class SendMessage(BasePacket):
                 if bmap:
                     # parse mode_vn int from regex
                     if r_match["mode_vn"] is not None:
-                        mode_vn = {"Taiko": 1, "CatchTheBeat": 2, "osu!mania": 3}[
-                            r_match["mode_vn"]
-                        ]
+                        mode_vn = _MODE_VN_BY_NAME[r_match["mode_vn"]]
                     else:
                         # use player mode if not specified
                         mode_vn = p.status.mode.as_vanilla
@@ -352,7 +396,7 @@ class Logout(BasePacket):
     def __init__(self, reader: BanchoPacketReader) -> None:
         reader.read_i32()  # reserved
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if (time.time() - p.login_time) < 1:
             # osu! has a weird tendency to log out immediately after login.
             # i've tested the times and they're generally 300-800ms, so
@@ -366,8 +410,8 @@ class Logout(BasePacket):
 
 @register(ClientPackets.REQUEST_STATUS_UPDATE, restricted=True)
 class StatsUpdateRequest(BasePacket):
-    async def handle(self, p: Player) -> None:
-        p.enqueue(packets.user_stats(p))
+    def handle(self, p: Player) -> None:
+        p.enqueue(p.stats_packet)
 
 
 # Some messages to send on welcome/restricted/etc.
@@ -396,6 +440,29 @@ OFFLINE_NOTIFICATION = packets.notification(
     "some features will be unavailble.",
 )
 
+# packets sent identically on every login; no need to rebuild them.
+PROTOCOL_VERSION_PACKET = packets.protocol_version(19)
+CHANNEL_INFO_END_PACKET = packets.channel_info_end()
+MAIN_MENU_ICON_PACKET = packets.main_menu_icon()
+
+# likewise for the responses to failed logins.
+VERSION_UPDATE_RESPONSE = packets.version_update_forced() + packets.user_id(-2)
+RESTART_CLIENT_RESPONSE = packets.user_id(-1) + packets.notification(
+    "Please restart your osu! and try again.",
+)
+ALREADY_ONLINE_RESPONSE = packets.user_id(-1) + packets.notification(
+    "User already logged in.",
+)
+UNKNOWN_USERNAME_RESPONSE = packets.notification(
+    f"{BASE_DOMAIN}: Unknown username",
+) + packets.user_id(-1)
+INCORRECT_PASSWORD_RESPONSE = packets.notification(
+    f"{BASE_DOMAIN}: Incorrect password",
+) + packets.user_id(-1)
+CONTACT_STAFF_RESPONSE = packets.notification(
+    "Please contact staff directly to create an account.",
+) + packets.user_id(-1)
+
 DELTA_90_DAYS = timedelta(days=90)
 
 
@@ -433,19 +500,21 @@ async def login(
     # so copying here is fine for simplicity
     body = body_view.tobytes()
 
-    if len(split := body.decode().split("\n")[:-1]) != 3:
+    # split the body as bytes; the password md5 is
+    # used as bytes, so only the other fields get decoded.
+    if len(split := body.split(b"\n")[:-1]) != 3:
         log(f"Invalid login request from {ip}.", Ansi.LRED)
         return  # invalid request
 
-    username = split[0]
-    pw_md5 = split[1].encode()
+    username = split[0].decode()
+    pw_md5 = split[1]
 
-    if len(client_info := split[2].split("|")) != 5:
+    if len(client_info := split[2].decode().split("|")) != 5:
         return  # invalid request
 
     osu_ver_str = client_info[0]
 
-    if not (r_match := regexes.OSU_VERSION.match(osu_ver_str)):
+    if not (r_match := _OSU_VERSION_MATCH(osu_ver_str)):
         return  # invalid request
 
     # quite a bit faster than using dt.strptime.
@@ -466,7 +535,7 @@ async def login(
         # this is currently slow, but asottile is on the
         # case https://bugs.python.org/issue44307 :D
         if osu_ver_date < (date.today() - DELTA_90_DAYS):
-            return "no", packets.version_update_forced() + packets.user_id(-2)
+            return "no", VERSION_UPDATE_RESPONSE
 
     # ensure utc_offset is a number (negative inclusive).
     if not client_info[1].replace("-", "").isdecimal():
@@ -492,10 +561,7 @@ async def login(
     adapters = [a for a in adapters_str[:-1].split(".") if a]
 
     if not (is_wine or adapters):
-        data = packets.user_id(-1) + packets.notification(
-            "Please restart your osu! and try again.",
-        )
-        return "no", data
+        return "no", RESTART_CLIENT_RESPONSE
 
     pm_private = client_info[4] == "1"
 
@@ -517,11 +583,7 @@ async def login(
                     p.logout()
                 else:
                     # the user is currently online, send back failure.
-                    data = packets.user_id(-1) + packets.notification(
-                        "User already logged in.",
-                    )
-
-                    return "no", data
+                    return "no", ALREADY_ONLINE_RESPONSE
 
     await db_cursor.execute(
         "SELECT id, name, priv, pw_bcrypt, country, "
@@ -533,10 +595,7 @@ async def login(
 
     if not user_info:
         # no account by this name exists.
-        return "no", (
-            packets.notification(f"{BASE_DOMAIN}: Unknown username")
-            + packets.user_id(-1)
-        )
+        return "no", UNKNOWN_USERNAME_RESPONSE
 
     if using_tourney_client and not (
         user_info["priv"] & Privileges.DONATOR and user_info["priv"] & Privileges.NORMAL
@@ -553,112 +612,116 @@ async def login(
     # designed to be slow; we'll cache the results to speed up subsequent logins.
     if pw_bcrypt in bcrypt_cache:  # ~0.01 ms
         if pw_md5 != bcrypt_cache[pw_bcrypt]:
-            return "no", (
-                packets.notification(f"{BASE_DOMAIN}: Incorrect password")
-                + packets.user_id(-1)
-            )
+            return "no", INCORRECT_PASSWORD_RESPONSE
     else:  # ~200ms
-        if not bcrypt.checkpw(pw_md5, pw_bcrypt):
-            return "no", (
-                packets.notification(f"{BASE_DOMAIN}: Incorrect password")
-                + packets.user_id(-1)
-            )
+        # bcrypt releases the gil, so run it in a worker thread
+        # rather than stalling every other request on the loop.
+        if not await asyncio.to_thread(bcrypt.checkpw, pw_md5, pw_bcrypt):
+            return "no", INCORRECT_PASSWORD_RESPONSE
 
         bcrypt_cache[pw_bcrypt] = pw_md5
 
     """ login credentials verified """
 
-    await db_cursor.execute(
-        "INSERT INTO ingame_logins "
-        "(userid, ip, osu_ver, osu_stream, datetime) "
-        "VALUES (%s, %s, %s, %s, NOW())",
-        [user_info["id"], str(ip), osu_ver_date, osu_ver_stream],
-    )
+    if not ip.is_private and glob.geoloc_db is None:
+        # we'll need to do an external geoloc lookup; start it
+        # now so it can run while we make our sql queries.
+        geoloc_task = asyncio.create_task(misc.utils.fetch_geoloc_web(ip))
+    else:
+        geoloc_task = None
 
-    await db_cursor.execute(
-        "INSERT INTO client_hashes "
-        "(userid, osupath, adapters, uninstall_id,"
-        " disk_serial, latest_time, occurrences) "
-        "VALUES (%s, %s, %s, %s, %s, NOW(), 1) "
-        "ON DUPLICATE KEY UPDATE "
-        "occurrences = occurrences + 1, "
-        "latest_time = NOW() ",
-        [user_info["id"], osu_path_md5, adapters_md5, uninstall_md5, disk_sig_md5],
-    )
+    try:
+        await db_cursor.execute(
+            "INSERT INTO ingame_logins "
+            "(userid, ip, osu_ver, osu_stream, datetime) "
+            "VALUES (%s, %s, %s, %s, NOW())",
+            [user_info["id"], str(ip), osu_ver_date, osu_ver_stream],
+        )
 
-    # TODO: store adapters individually
+        await db_cursor.execute(
+            "INSERT INTO client_hashes "
+            "(userid, osupath, adapters, uninstall_id,"
+            " disk_serial, latest_time, occurrences) "
+            "VALUES (%s, %s, %s, %s, %s, NOW(), 1) "
+            "ON DUPLICATE KEY UPDATE "
+            "occurrences = occurrences + 1, "
+            "latest_time = NOW() ",
+            [user_info["id"], osu_path_md5, adapters_md5, uninstall_md5, disk_sig_md5],
+        )
 
-    if is_wine:
-        hw_checks = "h.uninstall_id = %s"
-        hw_args = [uninstall_md5]
-    else:
-        hw_checks = "h.adapters = %s OR h.uninstall_id = %s OR h.disk_serial = %s"
-        hw_args = [adapters_md5, uninstall_md5, disk_sig_md5]
+        # TODO: store adapters individually
 
-    await db_cursor.execute(
-        "SELECT u.name, u.priv, h.occurrences "
-        "FROM client_hashes h "
-        "INNER JOIN users u ON h.userid = u.id "
-        "WHERE h.userid != %s AND "
-        f"({hw_checks})",
-        [user_info["id"], *hw_args],
-    )
+        if is_wine:
+            hw_checks = "h.uninstall_id = %s"
+            hw_args = [uninstall_md5]
+        else:
+            hw_checks = "h.adapters = %s OR h.uninstall_id = %s OR h.disk_serial = %s"
+            hw_args = [adapters_md5, uninstall_md5, disk_sig_md5]
 
-    if db_cursor.rowcount != 0:
-        # we have other accounts with matching hashes
-        hw_matches = await db_cursor.fetchall()
+        await db_cursor.execute(
+            "SELECT u.name, u.priv, h.occurrences "
+            "FROM client_hashes h "
+            "INNER JOIN users u ON h.userid = u.id "
+            "WHERE h.userid != %s AND "
+            f"({hw_checks})",
+            [user_info["id"], *hw_args],
+        )
 
-        if user_info["priv"] & Privileges.VERIFIED:
-            # TODO: this is a normal, registered & verified player.
-            ...
-        else:
-            # this player is not verified yet, this is their first
-            # time connecting in-game and submitting their hwid set.
-            # we will not allow any banned matches; if there are any,
-            # then ask the user to contact staff and resolve manually.
-            if not all(
-                [hw_match["priv"] & Privileges.NORMAL for hw_match in hw_matches],
-            ):
-                return "no", (
-                    packets.notification(
-                        "Please contact staff directly to create an account.",
-                    )
-                    + packets.user_id(-1)
-                )
+        if db_cursor.rowcount != 0:
+            # we have other accounts with matching hashes
+            hw_matches = await db_cursor.fetchall()
+
+            if user_info["priv"] & Privileges.VERIFIED:
+                # TODO: this is a normal, registered & verified player.
+                ...
+            else:
+                # this player is not verified yet, this is their first
+                # time connecting in-game and submitting their hwid set.
+                # we will not allow any banned matches; if there are any,
+                # then ask the user to contact staff and resolve manually.
+                if not all(
+                    hw_match["priv"] & Privileges.NORMAL for hw_match in hw_matches
+                ):
+                    return "no", CONTACT_STAFF_RESPONSE
 
-    """ All checks passed, player is safe to login """
+        """ All checks passed, player is safe to login """
 
-    # get clan & clan priv if we're in a clan
-    if user_info["clan_id"] != 0:
-        clan = glob.clans.get(id=user_info.pop("clan_id"))
-        clan_priv = ClanPrivileges(user_info.pop("clan_priv"))
-    else:
-        del user_info["clan_id"]
-        del user_info["clan_priv"]
-        clan = clan_priv = None
-
-    db_country = user_info.pop("country")
-
-    if not ip.is_private:
-        if glob.geoloc_db is not None:
-            # good, dev has downloaded a geoloc db from maxmind,
-            # so we can do a local db lookup. (typically ~1-5ms)
-            # https://www.maxmind.com/en/home
-            user_info["geoloc"] = misc.utils.fetch_geoloc_db(ip)
+        # get clan & clan priv if we're in a clan
+        if user_info["clan_id"] != 0:
+            clan = glob.clans.get(id=user_info.pop("clan_id"))
+            clan_priv = ClanPrivileges(user_info.pop("clan_priv"))
         else:
-            # bad, we must do an external db lookup using
-            # a public api. (depends, `ping ip-api.com`)
-            user_info["geoloc"] = await misc.utils.fetch_geoloc_web(ip)
-
-        if db_country == "xx":
-            # bugfix for old gulag versions when
-            # country wasn't stored on registration.
-            log(f"Fixing {username}'s country.", Ansi.LGREEN)
-
-            await db_cursor.execute(
-                "UPDATE users SET country = %s WHERE id = %s",
-                [user_info["geoloc"]["country"]["acronym"], user_info["id"]],
-            )
+            del user_info["clan_id"]
+            del user_info["clan_priv"]
+            clan = clan_priv = None
+
+        db_country = user_info.pop("country")
+
+        if not ip.is_private:
+            if glob.geoloc_db is not None:
+                # good, dev has downloaded a geoloc db from maxmind,
+                # so we can do a local db lookup. (typically ~1-5ms)
+                # https://www.maxmind.com/en/home
+                user_info["geoloc"] = misc.utils.fetch_geoloc_db(ip)
+            else:
+                # bad, we must do an external db lookup using
+                # a public api. (depends, `ping ip-api.com`)
+                user_info["geoloc"] = await geoloc_task
+
+            if db_country == "xx":
+                # bugfix for old gulag versions when
+                # country wasn't stored on registration.
+                log(f"Fixing {username}'s country.", Ansi.LGREEN)
+
+                await db_cursor.execute(
+                    "UPDATE users SET country = %s WHERE id = %s",
+                    [user_info["geoloc"]["country"]["acronym"], user_info["id"]],
+                )
+    finally:
+        # don't leave the lookup running if the login was rejected
+        # (or failed); this is a no-op if we've already awaited it.
+        if geoloc_task is not None:
+            geoloc_task.cancel()
 
     p = Player(
         **user_info,  # {id, name, priv, pw_bcrypt, silence_end, api_key, geoloc?}
@@ -671,8 +734,8 @@ async def login(
         tourney_client=using_tourney_client,
     )
 
-    data = bytearray(packets.protocol_version(19))
-    data += packets.user_id(p.id)
+    # collect the response's packets, and join them once at the end.
+    data = [PROTOCOL_VERSION_PACKET, packets.user_id(p.id)]
 
     # *real* client privileges are sent with this packet,
     # then the user's apparent privileges are sent in the
@@ -681,12 +744,12 @@ async def login(
     # but not in userPresence (so that only donators
     # show up with the yellow name in-game, but everyone
     # gets osu!direct & other in-game perks).
-    data += packets.bancho_privileges(p.bancho_priv | ClientPrivileges.SUPPORTER)
+    data.append(packets.bancho_privileges(p.bancho_priv | ClientPrivileges.SUPPORTER))
 
-    data += WELCOME_NOTIFICATION
+    data.append(WELCOME_NOTIFICATION)
 
     if not glob.has_internet:
-        data += OFFLINE_NOTIFICATION
+        data.append(OFFLINE_NOTIFICATION)
 
     # send all appropriate channel info to our player.
     # the osu! client will attempt to join the channels.
@@ -702,14 +765,14 @@ async def login(
         # the channel (to update their playercounts)
         chan_info_packet = packets.channel_info(c._name, c.topic, len(c.players))
 
-        data += chan_info_packet
+        data.append(chan_info_packet)
 
         for o in glob.players:
             if c.can_read(o.priv):
                 o.enqueue(chan_info_packet)
 
     # tells osu! to reorder channels based on config.
-    data += packets.channel_info_end()
+    data.append(CHANNEL_INFO_END_PACKET)
 
     # fetch some of the player's
     # information from sql to be cached.
@@ -719,14 +782,14 @@ async def login(
 
     # TODO: fetch p.recent_scores from sql
 
-    data += packets.main_menu_icon()
-    data += packets.friends_list(*p.friends)
-    data += packets.silence_end(p.remaining_silence)
+    data.append(MAIN_MENU_ICON_PACKET)
+    data.append(packets.friends_list(*p.friends))
+    data.append(packets.silence_end(p.remaining_silence))
 
     # update our new player's stats, and broadcast them.
-    user_data = packets.user_presence(p) + packets.user_stats(p)
+    user_data = p.presence_packet + p.stats_packet
 
-    data += user_data
+    data.append(user_data)
 
     if not p.restricted:
         # player is unrestricted, two way data
@@ -736,8 +799,7 @@ async def login(
 
             # enqueue them to us.
             if not o.restricted:
-                data += packets.user_presence(o)
-                data += packets.user_stats(o)
+                data.extend((o.presence_packet, o.stats_packet))
 
         # the player may have been sent mail while offline,
         # enqueue any messages from their respective authors.
@@ -754,22 +816,26 @@ async def login(
 
             async for msg in db_cursor:
                 if msg["from"] not in sent_to:
-                    data += packets.send_message(
-                        sender=msg["from"],
-                        msg="Unread messages",
-                        recipient=msg["to"],
-                        sender_id=msg["from_id"],
+                    data.append(
+                        packets.send_message(
+                            sender=msg["from"],
+                            msg="Unread messages",
+                            recipient=msg["to"],
+                            sender_id=msg["from_id"],
+                        ),
                     )
                     sent_to.add(msg["from"])
 
                 msg_time = datetime.fromtimestamp(msg["time"])
                 msg_ts = f'[{msg_time:%a %b %d @ %H:%M%p}] {msg["msg"]}'
 
-                data += packets.send_message(
-                    sender=msg["from"],
-                    msg=msg_ts,
-                    recipient=msg["to"],
-                    sender_id=msg["from_id"],
+                data.append(
+                    packets.send_message(
+                        sender=msg["from"],
+                        msg=msg_ts,
+                        recipient=msg["to"],
+                        sender_id=msg["from_id"],
+                    ),
                 )
 
         if not p.priv & Privileges.VERIFIED:
@@ -789,26 +855,30 @@ async def login(
                     | Privileges.ALUMNI,
                 )
 
-            data += packets.send_message(
-                sender=glob.bot.name,
-                msg=WELCOME_MSG,
-                recipient=p.name,
-                sender_id=glob.bot.id,
+            data.append(
+                packets.send_message(
+                    sender=glob.bot.name,
+                    msg=WELCOME_MSG,
+                    recipient=p.name,
+                    sender_id=glob.bot.id,
+                ),
             )
 
     else:
         # player is restricted, one way data
         for o in glob.players.unrestricted:
             # enqueue them to us.
-            data += packets.user_presence(o)
-            data += packets.user_stats(o)
-
-        data += packets.account_restricted()
-        data += packets.send_message(
-            sender=glob.bot.name,
-            msg=RESTRICTED_MSG,
-            recipient=p.name,
-            sender_id=glob.bot.id,
+            data.append(o.presence_packet)
+            data.append(o.stats_packet)
+
+        data.append(packets.account_restricted())
+        data.append(
+            packets.send_message(
+                sender=glob.bot.name,
+                msg=RESTRICTED_MSG,
+                recipient=p.name,
+                sender_id=glob.bot.id,
+            ),
         )
 
     # TODO: some sort of admin panel for staff members?
@@ -833,15 +903,17 @@ async def login(
     )
 
     p.update_latest_activity()
-    return p.token, bytes(data)
+    return p.token, b"".join(data)
 
 
 @register(ClientPackets.START_SPECTATING)
 class StartSpectating(BasePacket):
+    __slots__ = ("target_id",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.target_id = reader.read_i32()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (new_host := glob.players.get(id=self.target_id)):
             log(f"{p} tried to spectate nonexistant id {self.target_id}.", Ansi.LYELLOW)
             return
@@ -870,7 +942,7 @@ class StartSpectating(BasePacket):
 
 @register(ClientPackets.STOP_SPECTATING)
 class StopSpectating(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         host = p.spectating
 
         if not host:
@@ -882,10 +954,12 @@ class StopSpectating(BasePacket):
 
 @register(ClientPackets.SPECTATE_FRAMES)
 class SpectateFrames(BasePacket):
+    __slots__ = ("frame_bundle",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.frame_bundle = reader.read_replayframe_bundle()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         # packing this manually is about ~3x faster
         # data = packets.spectateFrames(self.frame_bundle.raw_data)
         data = (
@@ -901,7 +975,7 @@ class SpectateFrames(BasePacket):
 
 @register(ClientPackets.CANT_SPECTATE)
 class CantSpectate(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not p.spectating:
             log(f"{p} sent can't spectate while not spectating?", Ansi.LRED)
             return
@@ -918,6 +992,8 @@ class CantSpectate(BasePacket):
 
 @register(ClientPackets.SEND_PRIVATE_MESSAGE)
 class SendPrivateMessage(BasePacket):
+    __slots__ = ("msg",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.msg = reader.read_message()
 
@@ -1001,7 +1077,7 @@ class SendPrivateMessage(BasePacket):
             )
         else:
             # messaging the bot, check for commands & /np.
-            if msg.startswith(glob.config.command_prefix):
+            if msg.startswith(_CMD_PREFIX):
                 cmd = await commands.process_commands(p, t, msg)
             else:
                 cmd = None
@@ -1012,7 +1088,7 @@ class SendPrivateMessage(BasePacket):
                     p.send(cmd["resp"], sender=t)
             else:
                 # no commands triggered.
-                if r_match := regexes.NOW_PLAYING.match(msg):
+                if r_match := _NOW_PLAYING_MATCH(msg):
                     # user is /np'ing a map.
                     # save it to their player instance
                     # so we can use this elsewhere owo..
@@ -1021,9 +1097,7 @@ class SendPrivateMessage(BasePacket):
                     if bmap:
                         # parse mode_vn int from regex
                         if r_match["mode_vn"] is not None:
-                            mode_vn = {"Taiko": 1, "CatchTheBeat": 2, "osu!mania": 3}[
-                                r_match["mode_vn"]
-                            ]
+                            mode_vn = _MODE_VN_BY_NAME[r_match["mode_vn"]]
                         else:
                             # use player mode if not specified
                             mode_vn = p.status.mode.as_vanilla
@@ -1138,13 +1212,13 @@ class SendPrivateMessage(BasePacket):
 
 @register(ClientPackets.PART_LOBBY)
 class LobbyPart(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         p.in_lobby = False
 
 
 @register(ClientPackets.JOIN_LOBBY)
 class LobbyJoin(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         p.in_lobby = True
 
         for m in glob.matches:
@@ -1154,10 +1228,12 @@ class LobbyJoin(BasePacket):
 
 @register(ClientPackets.CREATE_MATCH)
 class MatchCreate(BasePacket):
+    __slots__ = ("match",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.match = reader.read_match()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         # TODO: match validation..?
         if p.restricted:
             p.enqueue(
@@ -1233,6 +1309,8 @@ async def execute_menu_option(p: Player, key: int) -> None:
 
 @register(ClientPackets.JOIN_MATCH)
 class MatchJoin(BasePacket):
+    __slots__ = ("match_id", "match_passwd")
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.match_id = reader.read_i32()
         self.match_passwd = reader.read_string()
@@ -1275,17 +1353,19 @@ class MatchJoin(BasePacket):
 
 @register(ClientPackets.PART_MATCH)
 class MatchPart(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         p.update_latest_activity()
         p.leave_match()
 
 
 @register(ClientPackets.MATCH_CHANGE_SLOT)
 class MatchChangeSlot(BasePacket):
+    __slots__ = ("slot_id",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.slot_id = reader.read_i32()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1304,12 +1384,12 @@ class MatchChangeSlot(BasePacket):
         m.slots[self.slot_id].copy_from(slot)
         slot.reset()
 
-        m.enqueue_state()  # technically not needed for host?
+        m.enqueue_state_soon()  # technically not needed for host?
 
 
 @register(ClientPackets.MATCH_READY)
 class MatchReady(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1317,15 +1397,17 @@ class MatchReady(BasePacket):
         assert slot is not None
 
         slot.status = SlotStatus.ready
-        m.enqueue_state(lobby=False)
+        m.enqueue_state_soon(lobby=False)
 
 
 @register(ClientPackets.MATCH_LOCK)
 class MatchLock(BasePacket):
+    __slots__ = ("slot_id",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.slot_id = reader.read_i32()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1355,11 +1437,13 @@ class MatchLock(BasePacket):
 
             slot.status = SlotStatus.locked
 
-        m.enqueue_state()
+        m.enqueue_state_soon()
 
 
 @register(ClientPackets.MATCH_CHANGE_SETTINGS)
 class MatchChangeSettings(BasePacket):
+    __slots__ = ("new",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.new = reader.read_match()
 
@@ -1471,12 +1555,12 @@ class MatchChangeSettings(BasePacket):
 
         m.name = self.new.name
 
-        m.enqueue_state()
+        m.enqueue_state_soon()
 
 
 @register(ClientPackets.MATCH_START)
 class MatchStart(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1487,12 +1571,18 @@ class MatchStart(BasePacket):
         m.start()
 
 
+# packet id, padding byte & length; prefixed to all bancho packets.
+_pack_packet_header = struct.Struct("<HxI").pack_into
+
+
 @register(ClientPackets.MATCH_SCORE_UPDATE)
 class MatchScoreUpdate(BasePacket):
+    __slots__ = ("play_data",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.play_data = reader.read_raw()  # TODO: probably not necessary
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         # this runs very frequently in matches,
         # so it's written to run pretty quick.
 
@@ -1500,17 +1590,19 @@ class MatchScoreUpdate(BasePacket):
             return
 
         # if scorev2 is enabled, read an extra 8 bytes.
-        buf = bytearray(b"0\x00\x00")
-        buf += len(self.play_data).to_bytes(4, "little")
-        buf += self.play_data
+        # (allocate the whole packet up front, and write into it)
+        data_len = len(self.play_data)
+        buf = bytearray(7 + data_len)
+        _pack_packet_header(buf, 0, packets.ServerPackets.MATCH_SCORE_UPDATE, data_len)
+        buf[7:] = self.play_data
         buf[11] = m.get_slot_id(p)
 
-        m.enqueue(bytes(buf), lobby=False)
+        m.enqueue(buf, lobby=False)  # no copy; buf isn't reused
 
 
 @register(ClientPackets.MATCH_COMPLETE)
 class MatchComplete(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1520,18 +1612,18 @@ class MatchComplete(BasePacket):
         slot.status = SlotStatus.complete
 
         # check if there are any players that haven't finished.
-        if any([s.status == SlotStatus.playing for s in m.slots]):
+        if any(s.status == SlotStatus.playing for s in m.slots):
             return
 
         # find any players just sitting in the multi room
         # that have not been playing the map; they don't
         # need to know all the players have completed, only
         # the ones who are playing (just new match info).
-        not_playing = [
+        not_playing = {
             s.player.id
             for s in m.slots
             if s.status & SlotStatus.has_player and s.status != SlotStatus.complete
-        ]
+        }
 
         was_playing = [
             s for s in m.slots if s.player and s.player.id not in not_playing
@@ -1550,10 +1642,12 @@ class MatchComplete(BasePacket):
 
 @register(ClientPackets.MATCH_CHANGE_MODS)
 class MatchChangeMods(BasePacket):
+    __slots__ = ("mods",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.mods = reader.read_i32()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1575,7 +1669,7 @@ class MatchChangeMods(BasePacket):
             # not freemods, set match mods.
             m.mods = Mods(self.mods)
 
-        m.enqueue_state()
+        m.enqueue_state_soon()
 
 
 def is_playing(slot: Slot) -> bool:
@@ -1584,7 +1678,7 @@ def is_playing(slot: Slot) -> bool:
 
 @register(ClientPackets.MATCH_LOAD_COMPLETE)
 class MatchLoadComplete(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1602,7 +1696,7 @@ class MatchLoadComplete(BasePacket):
 
 @register(ClientPackets.MATCH_NO_BEATMAP)
 class MatchNoBeatmap(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1610,12 +1704,12 @@ class MatchNoBeatmap(BasePacket):
         assert slot is not None
 
         slot.status = SlotStatus.no_map
-        m.enqueue_state(lobby=False)
+        m.enqueue_state_soon(lobby=False)
 
 
 @register(ClientPackets.MATCH_NOT_READY)
 class MatchNotReady(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1623,12 +1717,12 @@ class MatchNotReady(BasePacket):
         assert slot is not None
 
         slot.status = SlotStatus.not_ready
-        m.enqueue_state(lobby=False)
+        m.enqueue_state_soon(lobby=False)
 
 
 @register(ClientPackets.MATCH_FAILED)
 class MatchFailed(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1642,7 +1736,7 @@ class MatchFailed(BasePacket):
 
 @register(ClientPackets.MATCH_HAS_BEATMAP)
 class MatchHasBeatmap(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1650,12 +1744,12 @@ class MatchHasBeatmap(BasePacket):
         assert slot is not None
 
         slot.status = SlotStatus.not_ready
-        m.enqueue_state(lobby=False)
+        m.enqueue_state_soon(lobby=False)
 
 
 @register(ClientPackets.MATCH_SKIP_REQUEST)
 class MatchSkipRequest(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1675,10 +1769,12 @@ class MatchSkipRequest(BasePacket):
 
 @register(ClientPackets.CHANNEL_JOIN, restricted=True)
 class ChannelJoin(BasePacket):
+    __slots__ = ("name",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.name = reader.read_string()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if self.name in IGNORED_CHANNELS:
             return
 
@@ -1691,10 +1787,12 @@ class ChannelJoin(BasePacket):
 
 @register(ClientPackets.MATCH_TRANSFER_HOST)
 class MatchTransferHost(BasePacket):
+    __slots__ = ("slot_id",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.slot_id = reader.read_i32()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1717,10 +1815,12 @@ class MatchTransferHost(BasePacket):
 
 @register(ClientPackets.TOURNAMENT_MATCH_INFO_REQUEST)
 class TourneyMatchInfoRequest(BasePacket):
+    __slots__ = ("match_id",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.match_id = reader.read_i32()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not 0 <= self.match_id < 64:
             return  # invalid match id
 
@@ -1735,10 +1835,12 @@ class TourneyMatchInfoRequest(BasePacket):
 
 @register(ClientPackets.TOURNAMENT_JOIN_MATCH_CHANNEL)
 class TourneyMatchJoinChannel(BasePacket):
+    __slots__ = ("match_id",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.match_id = reader.read_i32()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not 0 <= self.match_id < 64:
             return  # invalid match id
 
@@ -1760,10 +1862,12 @@ class TourneyMatchJoinChannel(BasePacket):
 
 @register(ClientPackets.TOURNAMENT_LEAVE_MATCH_CHANNEL)
 class TourneyMatchLeaveChannel(BasePacket):
+    __slots__ = ("match_id",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.match_id = reader.read_i32()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not 0 <= self.match_id < 64:
             return  # invalid match id
 
@@ -1780,6 +1884,8 @@ class TourneyMatchLeaveChannel(BasePacket):
 
 @register(ClientPackets.FRIEND_ADD)
 class FriendAdd(BasePacket):
+    __slots__ = ("user_id",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.user_id = reader.read_i32()
 
@@ -1800,6 +1906,8 @@ class FriendAdd(BasePacket):
 
 @register(ClientPackets.FRIEND_REMOVE)
 class FriendRemove(BasePacket):
+    __slots__ = ("user_id",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.user_id = reader.read_i32()
 
@@ -1817,7 +1925,7 @@ class FriendRemove(BasePacket):
 
 @register(ClientPackets.MATCH_CHANGE_TEAM)
 class MatchChangeTeam(BasePacket):
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1830,15 +1938,17 @@ class MatchChangeTeam(BasePacket):
         else:
             slot.team = MatchTeams.blue
 
-        m.enqueue_state(lobby=False)
+        m.enqueue_state_soon(lobby=False)
 
 
 @register(ClientPackets.CHANNEL_PART, restricted=True)
 class ChannelPart(BasePacket):
+    __slots__ = ("name",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.name = reader.read_string()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if self.name in IGNORED_CHANNELS:
             return
 
@@ -1858,10 +1968,12 @@ class ChannelPart(BasePacket):
 
 @register(ClientPackets.RECEIVE_UPDATES, restricted=True)
 class ReceiveUpdates(BasePacket):
+    __slots__ = ("value",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.value = reader.read_i32()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not 0 <= self.value < 3:
             log(f"{p} tried to set his presence filter to {self.value}?")
             return
@@ -1871,33 +1983,41 @@ class ReceiveUpdates(BasePacket):
 
 @register(ClientPackets.SET_AWAY_MESSAGE)
 class SetAwayMessage(BasePacket):
+    __slots__ = ("msg",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.msg = reader.read_message()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         p.away_msg = self.msg.text
 
 
 @register(ClientPackets.USER_STATS_REQUEST, restricted=True)
 class StatsRequest(BasePacket):
+    __slots__ = ("user_ids",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.user_ids = reader.read_i32_list_i16l()
 
-    async def handle(self, p: Player) -> None:
-        unrestrcted_ids = [p.id for p in glob.players.unrestricted]
-        is_online = lambda o: o in unrestrcted_ids and o != p.id
+    def handle(self, p: Player) -> None:
+        # look each id up directly, rather than
+        # building the set of unrestricted players.
+        for pid in self.user_ids:
+            if pid == p.id:
+                continue
 
-        for online in filter(is_online, self.user_ids):
-            if t := glob.players.get(id=online):
-                p.enqueue(packets.user_stats(t))
+            if (t := glob.players.get(id=pid)) and t.priv & Privileges.NORMAL:
+                p.enqueue(t.stats_packet)
 
 
 @register(ClientPackets.MATCH_INVITE)
 class MatchInvite(BasePacket):
+    __slots__ = ("user_id",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.user_id = reader.read_i32()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not p.match:
             return
 
@@ -1917,10 +2037,12 @@ class MatchInvite(BasePacket):
 
 @register(ClientPackets.MATCH_CHANGE_PASSWORD)
 class MatchChangePassword(BasePacket):
+    __slots__ = ("match",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.match = reader.read_match()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         if not (m := p.match):
             return
 
@@ -1934,34 +2056,40 @@ class MatchChangePassword(BasePacket):
 
 @register(ClientPackets.USER_PRESENCE_REQUEST)
 class UserPresenceRequest(BasePacket):
+    __slots__ = ("user_ids",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.user_ids = reader.read_i32_list_i16l()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         for pid in self.user_ids:
             if t := glob.players.get(id=pid):
-                p.enqueue(packets.user_presence(t))
+                p.enqueue(t.presence_packet)
 
 
 @register(ClientPackets.USER_PRESENCE_REQUEST_ALL)
 class UserPresenceRequestAll(BasePacket):
+    __slots__ = ("ingame_time",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         # TODO: should probably ratelimit with this (300k s)
         self.ingame_time = reader.read_i32()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         # NOTE: this packet is only used when there
         # are >256 players visible to the client.
 
-        p.enqueue(b"".join(map(packets.user_presence, glob.players.unrestricted)))
+        p.enqueue(b"".join([o.presence_packet for o in glob.players.unrestricted]))
 
 
 @register(ClientPackets.TOGGLE_BLOCK_NON_FRIEND_DMS)
 class ToggleBlockingDMs(BasePacket):
+    __slots__ = ("value",)
+
     def __init__(self, reader: BanchoPacketReader) -> None:
         self.value = reader.read_i32()
 
-    async def handle(self, p: Player) -> None:
+    def handle(self, p: Player) -> None:
         p.pm_private = self.value == 1
 
         p.update_latest_activity()
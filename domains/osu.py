@@ -630,8 +630,11 @@ async def osuSubmitModularSelector(
         score.player.status.mods = score.mods
         score.player.status.mode = score.mode
 
+        score.player.__dict__.pop("presence_packet", None)  # wipe cached_property
+        score.player.__dict__.pop("stats_packet", None)  # wipe cached_property
+
         if not score.player.restricted:
-            glob.players.enqueue(packets.user_stats(score.player))
+            glob.players.enqueue(score.player.stats_packet)
 
     scores_table = score.mode.scores_table
     mode_vn = score.mode.as_vanilla
@@ -902,7 +905,11 @@ async def osuSubmitModularSelector(
 
     # send any stat changes to sql, and other players
     await db_cursor.execute(stats_query, stats_query_args)
-    glob.players.enqueue(packets.user_stats(score.player))
+
+    score.player.__dict__.pop("presence_packet", None)  # wipe cached_property
+    score.player.__dict__.pop("stats_packet", None)  # wipe cached_property
+
+    glob.players.enqueue(score.player.stats_packet)
 
     if not score.player.restricted:
         # update beatmap with new stats
@@ -1149,8 +1156,11 @@ async def getScores(
         p.status.mods = mods
         p.status.mode = mode
 
+        p.__dict__.pop("presence_packet", None)  # wipe cached_property
+        p.__dict__.pop("stats_packet", None)  # wipe cached_property
+
         if not p.restricted:
-            glob.players.enqueue(packets.user_stats(p))
+            glob.players.enqueue(p.stats_packet)
 
     scores_table = mode.scores_table
     scoring_metric = "pp" if mode >= GameMode.RELAX_OSU else "score"
@@ -1,6 +1,7 @@
 import functools
 import hashlib
 from collections import defaultdict
+from collections import OrderedDict
 from datetime import datetime
 from datetime import timedelta
 from enum import IntEnum
@@ -47,6 +48,12 @@ async def osuapiv1_getbeatmaps(**params) -> Optional[list[dict[str, Any]]]:
             return await resp.json()
 
 
+# {osu_file_path: md5} of .osu files we've already verified
+# (or written), so we don't re-read & hash them every time.
+_verified_osu_files: OrderedDict[Path, str] = OrderedDict()
+VERIFIED_OSU_FILES_MAX = 4096
+
+
 async def ensure_local_osu_file(
     osu_file_path: Path,
     bmap_id: int,
@@ -54,6 +61,10 @@ async def ensure_local_osu_file(
 ) -> bool:
     """Ensure we have the latest .osu file locally,
     downloading it from the osu!api if required."""
+    if _verified_osu_files.get(osu_file_path) == bmap_md5:
+        _verified_osu_files.move_to_end(osu_file_path)
+        return True
+
     if (
         not osu_file_path.exists()
         or hashlib.md5(osu_file_path.read_bytes()).hexdigest() != bmap_md5
@@ -70,7 +81,19 @@ async def ensure_local_osu_file(
                 await misc.utils.log_strange_occurrence(stacktrace)
                 return False
 
-            osu_file_path.write_bytes(await r.read())
+            osu_file_data = await r.read()
+            osu_file_path.write_bytes(osu_file_data)
+
+            if hashlib.md5(osu_file_data).hexdigest() != bmap_md5:
+                # the osu!api gave us a different version; don't
+                # remember it as verified, so we'll try it again.
+                return True
+
+    _verified_osu_files[osu_file_path] = bmap_md5
+    _verified_osu_files.move_to_end(osu_file_path)
+
+    if len(_verified_osu_files) > VERIFIED_OSU_FILES_MAX:
+        _verified_osu_files.popitem(last=False)
 
     return True
 
@@ -264,6 +287,7 @@ class Beatmap:
         "diff",
         "filename",
         "pp_cache",
+        "__dict__",
     )
 
     def __init__(self, **kwargs: Any) -> None:
@@ -308,17 +332,32 @@ class Beatmap:
     def __repr__(self) -> str:
         return self.full
 
-    @property
+    @staticmethod
+    def make_full(artist: str, title: str, version: str) -> str:
+        """The full osu! formatted name of a map."""
+        return f"{artist} - {title} [{version}]"
+
+    @staticmethod
+    def make_url(id: int) -> str:
+        """The osu! beatmap url for the map with `id`."""
+        return f"https://osu.{BASE_DOMAIN}/beatmaps/{id}"
+
+    @staticmethod
+    def make_embed(id: int, artist: str, title: str, version: str) -> str:
+        """An osu! chat embed to the osu! beatmap page of the map with `id`."""
+        return f"[{Beatmap.make_url(id)} {Beatmap.make_full(artist, title, version)}]"
+
+    @functools.cached_property
     def full(self) -> str:
         """The full osu! formatted name `self`."""
-        return f"{self.artist} - {self.title} [{self.version}]"
+        return self.make_full(self.artist, self.title, self.version)
 
     @property
     def url(self) -> str:
         """The osu! beatmap url for `self`."""
-        return f"https://osu.{BASE_DOMAIN}/beatmaps/{self.id}"
+        return self.make_url(self.id)
 
-    @property
+    @functools.cached_property
     def embed(self) -> str:
         """An osu! chat embed to `self`'s osu! beatmap page."""
         return f"[{self.url} {self.full}]"
@@ -472,6 +511,12 @@ class Beatmap:
             osuapi_resp["creator"],
         )
 
+        if "full" in self.__dict__:
+            del self.full  # wipe cached_property
+
+        if "embed" in self.__dict__:
+            del self.embed  # wipe cached_property
+
         self.filename = (
             ("{artist} - {title} ({creator}) [{version}].osu")
             .format(**osuapi_resp)
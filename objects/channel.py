@@ -1,5 +1,5 @@
 import functools
-from typing import Sequence
+from typing import Collection
 from typing import TYPE_CHECKING
 
 import packets
@@ -145,7 +145,7 @@ class Channel:
             # the channel from the global list.
             glob.channels.remove(self)
 
-    def enqueue(self, data: bytes, immune: Sequence[int] = []) -> None:
+    def enqueue(self, data: bytes | bytearray, immune: Collection[int] = ()) -> None:
         """Enqueue `data` to all connected clients not in `immune`."""
         for p in self.players:
             if p.id not in immune:
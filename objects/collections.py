@@ -2,7 +2,9 @@
 # in a lot of these classes; needs refactor.
 import asyncio
 from typing import Any
+from typing import Iterable
 from typing import Iterator
+from typing import KeysView
 from typing import Optional
 from typing import overload
 from typing import Sequence
@@ -40,6 +42,16 @@ __all__ = (
 class Channels(list[Channel]):
     """The currently active chat channels on the server."""
 
+    __slots__ = ("_by_name",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # {_name: channel}, so chat messages don't need to scan the list.
+        self._by_name: dict[str, Channel] = {}
+        for c in self:
+            self._by_name.setdefault(c._name, c)
+
     def __iter__(self) -> Iterator[Channel]:
         return super().__iter__()
 
@@ -82,13 +94,12 @@ class Channels(list[Channel]):
 
     def get_by_name(self, name: str) -> Optional[Channel]:
         """Get a channel from the list by `name`."""
-        for c in self:
-            if c._name == name:
-                return c
+        return self._by_name.get(name)
 
     def append(self, c: Channel) -> None:
         """Append `c` to the list."""
         super().append(c)
+        self._by_name.setdefault(c._name, c)
 
         if glob.app.debug:
             log(f"{c} added to channels list.")
@@ -97,6 +108,9 @@ class Channels(list[Channel]):
         """Remove `c` from the list."""
         super().remove(c)
 
+        if self._by_name.get(c._name) is c:
+            del self._by_name[c._name]
+
         if glob.app.debug:
             log(f"{c} removed from channels list.")
 
@@ -172,12 +186,23 @@ class Matches(list[Optional[Match]]):
 class Players(list[Player]):
     """The currently active players on the server."""
 
-    __slots__ = ("_lock",)
+    __slots__ = ("_lock", "_by_safe_name", "_by_id", "_staff")
 
     def __init__(self, *args, **kwargs):
         self._lock = asyncio.Lock()
         super().__init__(*args, **kwargs)
 
+        # {safe_name: player}, so lookups by
+        # name don't need to scan the list.
+        self._by_safe_name: dict[str, Player] = {}
+        self._by_id: dict[int, Player] = {}  # likewise for ids
+        self._staff: set[Player] = set()
+        for p in self:
+            self._by_safe_name.setdefault(p.safe_name, p)
+            self._by_id.setdefault(p.id, p)
+            if p.priv & Privileges.STAFF:
+                self._staff.add(p)
+
     def __iter__(self) -> Iterator[Player]:
         return super().__iter__()
 
@@ -193,14 +218,21 @@ class Players(list[Player]):
         return f'[{", ".join(map(repr, self))}]'
 
     @property
-    def ids(self) -> set[int]:
-        """Return a set of the current ids in the list."""
-        return {p.id for p in self}
+    def ids(self) -> KeysView[int]:
+        """Return a (set-like) view of the current ids in the list."""
+        return self._by_id.keys()
 
     @property
     def staff(self) -> set[Player]:
-        """Return a set of the current staff online."""
-        return {p for p in self if p.priv & Privileges.STAFF}
+        """Return a set of the current staff online (live; don't modify)."""
+        return self._staff
+
+    def refresh_staff(self, p: Player) -> None:
+        """Update whether `p` is in the staff set, after a privilege change."""
+        if p.priv & Privileges.STAFF and self._by_id.get(p.id) is p:
+            self._staff.add(p)
+        else:
+            self._staff.discard(p)
 
     @property
     def restricted(self) -> set[Player]:
@@ -235,6 +267,11 @@ class Players(list[Player]):
         """Get a player by token, id, or name from cache."""
         attr, val = self._parse_attr(kwargs)
 
+        if attr == "safe_name":
+            return self._by_safe_name.get(val)
+        elif attr == "id":
+            return self._by_id.get(val)
+
         for p in self:
             if getattr(p, attr) == val:
                 return p
@@ -298,6 +335,29 @@ class Players(list[Player]):
             return
 
         super().append(p)
+        self._by_safe_name.setdefault(p.safe_name, p)
+        self._by_id.setdefault(p.id, p)
+        if p.priv & Privileges.STAFF:
+            self._staff.add(p)
+
+    def extend(self, players: Iterable[Player]) -> None:
+        """Extend the list with `players`."""
+        for p in players:
+            self.append(p)
+
+    def bulk_add(self, players: Sequence[Player]) -> None:
+        """Add `players` to the list in one pass, without duplicate checks.
+
+        The caller must ensure none of `players` are already in the list."""
+        super().extend(players)
+
+        by_safe_name = self._by_safe_name
+        by_id = self._by_id
+        for p in players:
+            by_safe_name.setdefault(p.safe_name, p)
+            by_id.setdefault(p.id, p)
+            if p.priv & Privileges.STAFF:
+                self._staff.add(p)
 
     def remove(self, p: Player) -> None:
         """Remove `p` from the list."""
@@ -308,10 +368,28 @@ class Players(list[Player]):
 
         super().remove(p)
 
+        if self._by_safe_name.get(p.safe_name) is p:
+            del self._by_safe_name[p.safe_name]
+
+        if self._by_id.get(p.id) is p:
+            del self._by_id[p.id]
+
+        self._staff.discard(p)
+
 
 class MapPools(list[MapPool]):
     """The currently active mappools on the server."""
 
+    __slots__ = ("_by_name",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # {name: pool}, so lookups by name don't need to scan the list.
+        self._by_name: dict[str, MapPool] = {}
+        for p in self:
+            self._by_name.setdefault(p.name, p)
+
     def __iter__(self) -> Iterator[MapPool]:
         return super().__iter__()
 
@@ -341,19 +419,18 @@ class MapPools(list[MapPool]):
         """Check whether internal list contains `o`."""
         # Allow string to be passed to compare vs. name.
         if isinstance(o, str):
-            return o in [p.name for p in self]
+            return o in self._by_name
         else:
-            return o in self
+            return super().__contains__(o)
 
     def get_by_name(self, name: str) -> Optional[MapPool]:
         """Get a pool from the list by `name`."""
-        for p in self:
-            if p.name == name:
-                return p
+        return self._by_name.get(name)
 
     def append(self, mp: MapPool) -> None:
         """Append `mp` to the list."""
         super().append(mp)
+        self._by_name.setdefault(mp.name, mp)
 
         if glob.app.debug:
             log(f"{mp} added to mappools list.")
@@ -362,6 +439,9 @@ class MapPools(list[MapPool]):
         """Remove `mp` from the list."""
         super().remove(mp)
 
+        if self._by_name.get(mp.name) is mp:
+            del self._by_name[mp.name]
+
         if glob.app.debug:
             log(f"{mp} removed from mappools list.")
 
@@ -393,6 +473,25 @@ class MapPools(list[MapPool]):
 class Clans(list[Clan]):
     """The currently active clans on the server."""
 
+    __slots__ = ("_indexes",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # {attr: {value: clan}} for each attr that get() accepts,
+        # so lookups don't need to scan the list.
+        self._indexes: dict[str, dict[object, Clan]] = {
+            "name": {},
+            "tag": {},
+            "id": {},
+        }
+        for c in self:
+            self._index(c)
+
+    def _index(self, c: Clan) -> None:
+        for attr, index in self._indexes.items():
+            index.setdefault(getattr(c, attr), c)
+
     def __iter__(self) -> Iterator[Clan]:
         return super().__iter__()
 
@@ -419,9 +518,9 @@ class Clans(list[Clan]):
         """Check whether internal list contains `o`."""
         # Allow string to be passed to compare vs. name.
         if isinstance(o, str):
-            return o in [c.name for c in self]
+            return o in self._indexes["name"]
         else:
-            return o in self
+            return super().__contains__(o)
 
     def get(self, **kwargs: object) -> Optional[Clan]:
         """Get a clan by name, tag, or id."""
@@ -431,13 +530,12 @@ class Clans(list[Clan]):
         else:
             raise ValueError("Incorrect call to Clans.get()")
 
-        for c in self:
-            if getattr(c, attr) == val:
-                return c
+        return self._indexes[attr].get(val)
 
     def append(self, c: Clan) -> None:
         """Append `c` to the list."""
         super().append(c)
+        self._index(c)
 
         if glob.app.debug:
             log(f"{c} added to clans list.")
@@ -446,6 +544,10 @@ class Clans(list[Clan]):
         """Remove `m` from the list."""
         super().remove(c)
 
+        for attr, index in self._indexes.items():
+            if index.get(key := getattr(c, attr)) is c:
+                del index[key]
+
         if glob.app.debug:
             log(f"{c} removed from clans list.")
 
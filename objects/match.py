@@ -5,6 +5,7 @@ from datetime import datetime as datetime
 from datetime import timedelta as timedelta
 from enum import IntEnum
 from enum import unique
+from typing import Collection
 from typing import Optional
 from typing import overload
 from typing import Sequence
@@ -264,6 +265,9 @@ class Match:
         "winning_pts",
         "use_pp_scoring",
         "tourney_clients",
+        "_state_flush",
+        "_state_to_lobby",
+        "_slot_ids",
     )
 
     def __init__(self) -> None:
@@ -299,13 +303,20 @@ class Match:
         # scrimmage stuff
         self.is_scrimming = False
         self.match_points: dict[Union[MatchTeams, Player], int] = defaultdict(int)
-        self.bans: set[tuple[Mods, int]] = set()
+        self.bans: set[int] = set()  # (slot << 32) | mods, see commands.pack_pick
         self.winners: list[Union[Player, MatchTeams, None]] = []  # none for tie
         self.winning_pts = 0
         self.use_pp_scoring = False  # only for scrims
 
         self.tourney_clients: set[int] = set()  # player ids
 
+        # pending enqueue_state_soon() broadcast, if any.
+        self._state_flush: Optional[asyncio.Handle] = None
+        self._state_to_lobby = False
+
+        # {player: slot id}, filled in & checked by get_slot_id().
+        self._slot_ids: dict["Player", int] = {}
+
     @property
     def url(self) -> str:
         """The match's invitation url."""
@@ -355,16 +366,24 @@ class Match:
 
     def get_slot(self, p: "Player") -> Optional[Slot]:
         """Return the slot containing a given player."""
-        for s in self.slots:
-            if p is s.player:
-                return s
+        if (idx := self.get_slot_id(p)) is not None:
+            return self.slots[idx]
 
     def get_slot_id(self, p: "Player") -> Optional[int]:
         """Return the slot index containing a given player."""
+        # players rarely move, so remember where we last found them;
+        # slots are changed in many places, so always verify it.
+        idx = self._slot_ids.get(p)
+        if idx is not None and self.slots[idx].player is p:
+            return idx
+
         for idx, s in enumerate(self.slots):
             if p is s.player:
+                self._slot_ids[p] = idx
                 return idx
 
+        self._slot_ids.pop(p, None)
+
     def get_free(self) -> Optional[int]:
         """Return the first unoccupied slot in multi, if any."""
         for idx, s in enumerate(self.slots):
@@ -391,9 +410,9 @@ class Match:
 
     def enqueue(
         self,
-        data: bytes,
+        data: bytes | bytearray,
         lobby: bool = True,
-        immune: Sequence[int] = [],
+        immune: Collection[int] = (),
     ) -> None:
         """Add data to be sent to all clients in the match."""
         self.chat.enqueue(data, immune)
@@ -403,13 +422,51 @@ class Match:
 
     def enqueue_state(self, lobby: bool = True) -> None:
         """Enqueue `self`'s state to players in the match & lobby."""
-        # TODO: hmm this is pretty bad, writes twice
+        if self._state_flush is not None:
+            # this supersedes any broadcast pending from enqueue_state_soon().
+            self._state_flush.cancel()
+            self._state_flush = None
+
+            lobby |= self._state_to_lobby
+            self._state_to_lobby = False
 
         # send password only to users currently in the match.
-        self.chat.enqueue(packets.update_match(self, send_pw=True))
+        data = packets.update_match(self, send_pw=True)
+        self.chat.enqueue(data)
 
         if lobby and (lchan := glob.channels["#lobby"]) and lchan.players:
-            lchan.enqueue(packets.update_match(self, send_pw=False))
+            if self.passwd:
+                # the lobby needs a copy without the password.
+                data = packets.update_match(self, send_pw=False)
+
+            lchan.enqueue(data)
+
+    def enqueue_state_soon(self, lobby: bool = True) -> None:
+        """Enqueue `self`'s state at the end of the current request.
+
+        Clients often send several slot changes in one request; this
+        coalesces them into a single state broadcast. bancho_handler
+        flushes it before responding, and the event loop otherwise."""
+        self._state_to_lobby |= lobby
+
+        if self._state_flush is None:
+            loop = asyncio.get_running_loop()
+            self._state_flush = loop.call_soon(self.flush_state)
+
+    def flush_state(self) -> None:
+        """Enqueue the state broadcast pending from enqueue_state_soon(), if any."""
+        if self._state_flush is None:
+            return
+
+        self._state_flush.cancel()  # in case we're called early
+        self._state_flush = None
+
+        lobby = self._state_to_lobby
+        self._state_to_lobby = False
+
+        # the match may have been disposed in the meantime.
+        if glob.matches[self.id] is self:
+            self.enqueue_state(lobby=lobby)
 
     def unready_players(self, expected: SlotStatus = SlotStatus.ready) -> None:
         """Unready any players in the `expected` state."""
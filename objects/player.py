@@ -1,3 +1,4 @@
+import asyncio
 import time
 import uuid
 from dataclasses import dataclass
@@ -95,7 +96,7 @@ class ModeData:
     grades: dict[Grade, int]  # XH, X, SH, S, A
 
 
-@dataclass
+@dataclass(slots=True)
 class Status:
     """The current status of a player."""
 
@@ -169,8 +170,8 @@ class Player:
     tourney_client: `bool`
         Whether this is a management/spectator tourney client.
 
-    _queue: `bytearray`
-        Bytes enqueued to the player which will be transmitted
+    _queue: `list[bytes | bytearray]`
+        Packets enqueued to the player which will be transmitted
         at the tail end of their next connection to the server.
         XXX: cls.enqueue() will add data to this queue, and
              cls.dequeue() will return the data, and remove it.
@@ -190,6 +191,7 @@ class Player:
         "channels",
         "spectators",
         "spectating",
+        "spec_channel",
         "match",
         "stealth",
         "clan",
@@ -249,6 +251,7 @@ class Player:
         self.channels: list[Channel] = []
         self.spectators: list[Player] = []
         self.spectating: Optional[Player] = None
+        self.spec_channel: Optional[Channel] = None  # while being spectated
         self.match: Optional[Match] = None
         self.stealth = False
 
@@ -308,7 +311,7 @@ class Player:
         self.api_key = extras.get("api_key", None)
 
         # packet queue
-        self._queue = bytearray()
+        self._queue: list[bytes | bytearray] = []
 
     def __repr__(self) -> str:
         return f"<{self.name} ({self.id})>"
@@ -317,13 +320,23 @@ class Player:
     def online(self) -> bool:
         return self.token != ""
 
+    @staticmethod
+    def make_url(id: int) -> str:
+        """The url to the profile of the player with `id`."""
+        return f"https://{BASE_DOMAIN}/u/{id}"
+
+    @staticmethod
+    def make_embed(id: int, name: str) -> str:
+        """An osu! chat embed to the profile of the player with `id`."""
+        return f"[{Player.make_url(id)} {name}]"
+
     @cached_property
     def url(self) -> str:
         """The url to the player's profile."""
         # NOTE: this is currently never wiped because
         # domain & id cannot be changed in-game; if this
         # ever changes, it will need to be wiped.
-        return f"https://{BASE_DOMAIN}/u/{self.id}"
+        return self.make_url(self.id)
 
     @cached_property
     def embed(self) -> str:
@@ -331,7 +344,7 @@ class Player:
         # NOTE: this is currently never wiped because
         # url & name cannot be changed in-game; if this
         # ever changes, it will need to be wiped.
-        return f"[{self.url} {self.name}]"
+        return self.make_embed(self.id, self.name)
 
     @cached_property
     def avatar_url(self) -> str:
@@ -380,6 +393,20 @@ class Player:
             ret |= ClientPrivileges.OWNER
         return ret
 
+    @cached_property
+    def presence_packet(self) -> bytes:
+        """The player's userPresence packet, as sent to other players."""
+        # NOTE: this must be wiped whenever any of the presence's
+        # contents change (privileges, mode & rank, currently).
+        return packets.user_presence(self)
+
+    @cached_property
+    def stats_packet(self) -> bytes:
+        """The player's userStats packet, as sent to other players."""
+        # NOTE: this must be wiped whenever the player's status
+        # or the stats of their current mode change.
+        return packets.user_stats(self)
+
     @cached_property
     def restricted(self) -> bool:
         """Return whether the player is restricted."""
@@ -452,6 +479,7 @@ class Player:
     async def update_privs(self, new: Privileges) -> None:
         """Update `self`'s privileges to `new`."""
         self.priv = new
+        glob.players.refresh_staff(self)
 
         await glob.db.execute(
             "UPDATE users SET priv = %s WHERE id = %s",
@@ -464,9 +492,12 @@ class Player:
         if "bancho_priv" in self.__dict__:
             del self.bancho_priv  # wipe cached_property
 
+        self.__dict__.pop("presence_packet", None)  # wipe cached_property
+
     async def add_privs(self, bits: Privileges) -> None:
         """Update `self`'s privileges, adding `bits`."""
         self.priv |= bits
+        glob.players.refresh_staff(self)
 
         await glob.db.execute(
             "UPDATE users SET priv = %s WHERE id = %s",
@@ -476,9 +507,12 @@ class Player:
         if "bancho_priv" in self.__dict__:
             del self.bancho_priv  # wipe cached_property
 
+        self.__dict__.pop("presence_packet", None)  # wipe cached_property
+
     async def remove_privs(self, bits: Privileges) -> None:
         """Update `self`'s privileges, removing `bits`."""
         self.priv &= ~bits
+        glob.players.refresh_staff(self)
 
         await glob.db.execute(
             "UPDATE users SET priv = %s WHERE id = %s",
@@ -491,6 +525,8 @@ class Player:
         if "bancho_priv" in self.__dict__:
             del self.bancho_priv  # wipe cached_property
 
+        self.__dict__.pop("presence_packet", None)  # wipe cached_property
+
     async def restrict(self, admin: "Player", reason: str) -> None:
         """Restrict `self` for `reason`, and log to sql."""
         await self.remove_privs(Privileges.NORMAL)
@@ -670,6 +706,7 @@ class Player:
             new_status = SlotStatus.open
 
         slot.reset(new_status=new_status)
+        self.match._slot_ids.pop(self, None)  # don't keep us alive via the hint
 
         self.leave_channel(self.match.chat)
 
@@ -809,6 +846,8 @@ class Player:
             self.join_channel(spec_chan)
             glob.channels.append(spec_chan)
 
+        self.spec_channel = spec_chan
+
         # attempt to join their spectator channel.
         if not p.join_channel(spec_chan):
             log(f"{self} failed to join {spec_chan}?", Ansi.LYELLOW)
@@ -837,12 +876,13 @@ class Player:
         self.spectators.remove(p)
         p.spectating = None
 
-        c = glob.channels[f"#spec_{self.id}"]
+        c = self.spec_channel
         p.leave_channel(c)
 
         if not self.spectators:
             # remove host from channel, deleting it.
             self.leave_channel(c)
+            self.spec_channel = None
         else:
             # send new playercount
             c_info = packets.channel_info(c.name, c.topic, len(c.players))
@@ -983,6 +1023,10 @@ class Player:
             {self.id: stats.pp},
         )
         stats.rank = await self.get_global_rank(mode)
+
+        self.__dict__.pop("presence_packet", None)  # wipe cached_property
+        self.__dict__.pop("stats_packet", None)  # wipe cached_property
+
         return stats.rank
 
     async def stats_from_sql_full(self, db_cursor: aiomysql.DictCursor) -> None:
@@ -996,9 +1040,16 @@ class Player:
             [self.id],
         )
 
-        for mode, row in enumerate(await db_cursor.fetchall()):
-            # calculate player's rank.
-            row["rank"] = await self.get_global_rank(GameMode(mode))
+        rows = await db_cursor.fetchall()
+
+        # calculate player's ranks; these are redis
+        # lookups, so we can make them all at once.
+        ranks = await asyncio.gather(
+            *[self.get_global_rank(GameMode(mode)) for mode in range(len(rows))],
+        )
+
+        for mode, (row, rank) in enumerate(zip(rows, ranks)):
+            row["rank"] = rank
 
             row["grades"] = {
                 Grade.XH: row.pop("xh_count"),
@@ -1010,6 +1061,9 @@ class Player:
 
             self.stats[GameMode(mode)] = ModeData(**row)
 
+        self.__dict__.pop("presence_packet", None)  # wipe cached_property
+        self.__dict__.pop("stats_packet", None)  # wipe cached_property
+
     def send_menu_clear(self) -> None:
         """Clear the user's osu! chat with the bot
         to make room for a new menu to be sent."""
@@ -1044,14 +1098,19 @@ class Player:
         )
         glob.loop.create_task(task)
 
-    def enqueue(self, data: bytes) -> None:
+    def enqueue(self, data: bytes | bytearray) -> None:
         """Add data to be sent to the client."""
-        self._queue += data
+        # NOTE: nothing is written to the socket here; the queue is
+        # sent as a single response body on the client's next poll.
+        # only the reference is kept, so packets broadcast to many
+        # players (e.g. spectator frames) aren't copied per player;
+        # `data` must not be modified after it's been enqueued.
+        self._queue.append(data)
 
     def dequeue(self) -> Optional[bytes]:
         """Get data from the queue to send to the client."""
         if self._queue:
-            data = bytes(self._queue)
+            data = b"".join(self._queue)
             self._queue.clear()
             return data
 
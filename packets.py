@@ -6,9 +6,11 @@ from enum import unique
 from functools import cache
 from functools import lru_cache
 from typing import Any
+from typing import Awaitable
 from typing import Callable
 from typing import Iterator
 from typing import NamedTuple
+from typing import Optional
 from typing import Sequence
 from typing import Type
 from typing import TYPE_CHECKING
@@ -203,15 +205,35 @@ class ReplayFrameBundle(NamedTuple):
 
 
 class BasePacket(ABC):
+    # subclasses define their own __slots__, so
+    # per-packet instances don't carry a __dict__.
+    __slots__ = ()
+
     def __init__(self, reader: "BanchoPacketReader") -> None:
         ...
 
-    async def handle(self, p: "Player") -> None:
+    def handle(self, p: "Player") -> Optional[Awaitable[None]]:
+        """Handle the packet for `p`; handlers which
+        need to do i/o may be defined as coroutines."""
         ...
 
 
 PacketMap = dict[ClientPackets, Type[BasePacket]]
 
+# precompiled readers for the fixed-size types; these unpack
+# straight from the body's view, without slicing out a copy.
+_unpack_header = struct.Struct("<HxI").unpack_from
+_unpack_i16 = struct.Struct("<h").unpack_from
+_unpack_u16 = struct.Struct("<H").unpack_from
+_unpack_i32 = struct.Struct("<i").unpack_from
+_unpack_u32 = struct.Struct("<I").unpack_from
+_unpack_i64 = struct.Struct("<q").unpack_from
+_unpack_u64 = struct.Struct("<Q").unpack_from
+_unpack_f16 = struct.Struct("<e").unpack_from
+_unpack_f32 = struct.Struct("<f").unpack_from
+_unpack_f64 = struct.Struct("<d").unpack_from
+_unpack_replayframe = struct.Struct("<BBffi").unpack_from
+
 
 class BanchoPacketReader:
     """\
@@ -233,7 +255,8 @@ class BanchoPacketReader:
     >>> for packet in BanchoPacketReader(conn.body):
     ...     # once you're ready to handle the packet,
     ...     # simply call it's handle method.
-    ...     await packet.handle()
+    ...     if (coro := packet.handle(p)) is not None:
+    ...         await coro
     """
 
     __slots__ = ("body_view", "packet_map", "current_len")
@@ -273,9 +296,9 @@ class BanchoPacketReader:
     def _read_header(self) -> tuple[ClientPackets, int]:
         """Read the header of an osu! packet (id & length)."""
         # read type & length from the body
-        data = struct.unpack("<HxI", self.body_view[:7])
+        p_type, p_len = _unpack_header(self.body_view)
         self.body_view = self.body_view[7:]
-        return ClientPackets(data[0]), data[1]
+        return ClientPackets(p_type), p_len
 
     """ public API (exposed for packet handler's __init__ methods) """
 
@@ -297,49 +320,49 @@ class BanchoPacketReader:
         return val
 
     def read_i16(self) -> int:
-        val = int.from_bytes(self.body_view[:2], "little", signed=True)
+        (val,) = _unpack_i16(self.body_view)
         self.body_view = self.body_view[2:]
         return val
 
     def read_u16(self) -> int:
-        val = int.from_bytes(self.body_view[:2], "little", signed=False)
+        (val,) = _unpack_u16(self.body_view)
         self.body_view = self.body_view[2:]
         return val
 
     def read_i32(self) -> int:
-        val = int.from_bytes(self.body_view[:4], "little", signed=True)
+        (val,) = _unpack_i32(self.body_view)
         self.body_view = self.body_view[4:]
         return val
 
     def read_u32(self) -> int:
-        val = int.from_bytes(self.body_view[:4], "little", signed=False)
+        (val,) = _unpack_u32(self.body_view)
         self.body_view = self.body_view[4:]
         return val
 
     def read_i64(self) -> int:
-        val = int.from_bytes(self.body_view[:8], "little", signed=True)
+        (val,) = _unpack_i64(self.body_view)
         self.body_view = self.body_view[8:]
         return val
 
     def read_u64(self) -> int:
-        val = int.from_bytes(self.body_view[:8], "little", signed=False)
+        (val,) = _unpack_u64(self.body_view)
         self.body_view = self.body_view[8:]
         return val
 
     # floating-point types
 
     def read_f16(self) -> float:
-        (val,) = struct.unpack_from("<e", self.body_view[:2])
+        (val,) = _unpack_f16(self.body_view)
         self.body_view = self.body_view[2:]
         return val
 
     def read_f32(self) -> float:
-        (val,) = struct.unpack_from("<f", self.body_view[:4])
+        (val,) = _unpack_f32(self.body_view)
         self.body_view = self.body_view[4:]
         return val
 
     def read_f64(self) -> float:
-        (val,) = struct.unpack_from("<d", self.body_view[:8])
+        (val,) = _unpack_f64(self.body_view)
         self.body_view = self.body_view[8:]
         return val
 
@@ -348,18 +371,18 @@ class BanchoPacketReader:
     # XXX: some osu! packets use i16 for
     # array length, while others use i32
     def read_i32_list_i16l(self) -> tuple[int]:
-        length = int.from_bytes(self.body_view[:2], "little")
+        (length,) = _unpack_u16(self.body_view)
         self.body_view = self.body_view[2:]
 
-        val = struct.unpack(f'<{"I" * length}', self.body_view[: length * 4])
+        val = struct.unpack_from(f"<{length}I", self.body_view)
         self.body_view = self.body_view[length * 4 :]
         return val
 
     def read_i32_list_i32l(self) -> tuple[int]:
-        length = int.from_bytes(self.body_view[:4], "little")
+        (length,) = _unpack_u32(self.body_view)
         self.body_view = self.body_view[4:]
 
-        val = struct.unpack(f'<{"I" * length}', self.body_view[: length * 4])
+        val = struct.unpack_from(f"<{length}I", self.body_view)
         self.body_view = self.body_view[length * 4 :]
         return val
 
@@ -466,13 +489,10 @@ class BanchoPacketReader:
         return sf
 
     def read_replayframe(self) -> ReplayFrame:
-        return ReplayFrame(
-            button_state=self.read_u8(),
-            taiko_byte=self.read_u8(),  # pre-taiko support (<=2008)
-            x=self.read_f32(),
-            y=self.read_f32(),
-            time=self.read_i32(),
-        )
+        # button_state, taiko_byte (pre-taiko support, <=2008), x, y, time
+        val = ReplayFrame(*_unpack_replayframe(self.body_view))
+        self.body_view = self.body_view[14:]
+        return val
 
     def read_replayframe_bundle(self) -> ReplayFrameBundle:
         # save raw format to distribute to the other clients
@@ -563,10 +583,16 @@ def write_channel(name: str, topic: str, count: int) -> bytearray:
 #    return ret
 
 
+MATCH_HEADER_FMT = struct.Struct("<HbbI")
+MATCH_FOOTER_FMT = struct.Struct("<I4B")  # host id, mode, win cond, team type, fm
+
+
 def write_match(m: Match, send_pw: bool = True) -> bytearray:
     """Write `m` into bytes (osu! match)."""
+    slots = m.slots
+
     # 0 is for match type
-    ret = bytearray(struct.pack("<HbbI", m.id, m.in_progress, 0, m.mods))
+    ret = bytearray(MATCH_HEADER_FMT.pack(m.id, m.in_progress, 0, m.mods))
     ret += write_string(m.name)
 
     # osu expects \x0b\x00 if there's a password but it's
@@ -583,19 +609,22 @@ def write_match(m: Match, send_pw: bool = True) -> bytearray:
     ret += m.map_id.to_bytes(4, "little", signed=True)
     ret += write_string(m.map_md5)
 
-    ret.extend([s.status for s in m.slots])
-    ret.extend([s.team for s in m.slots])
+    ret.extend([s.status for s in slots])
+    ret.extend([s.team for s in slots])
 
-    for s in m.slots:
-        if s.status & SlotStatus.has_player:
-            ret += s.player.id.to_bytes(4, "little")
+    player_ids = [s.player.id for s in slots if s.status & SlotStatus.has_player]
+    ret += struct.pack(f"<{len(player_ids)}I", *player_ids)
 
-    ret += m.host.id.to_bytes(4, "little")
-    ret.extend((m.mode, m.win_condition, m.team_type, m.freemods))
+    ret += MATCH_FOOTER_FMT.pack(
+        m.host.id,
+        m.mode,
+        m.win_condition,
+        m.team_type,
+        m.freemods,
+    )
 
     if m.freemods:
-        for s in m.slots:
-            ret += s.mods.to_bytes(4, "little")
+        ret += struct.pack(f"<{len(slots)}I", *[s.mods for s in slots])
 
     ret += m.seed.to_bytes(4, "little")
     return ret